@@ -0,0 +1,17 @@
+import argparse
+import json
+
+from src.games.tarneeb.arena import format_report, parse_config, run_arena
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play two Tarneeb AI configurations head-to-head on duplicate deals")
+    parser.add_argument("config_a", help="AI config, e.g. 'medium' or 'hard:time_budget=0.05'")
+    parser.add_argument("config_b", help="AI config to compare against")
+    parser.add_argument("-n", "--deals", type=int, default=200, help="Number of deals (each is played twice, seats swapped)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible deals")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (defaults to all cores)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = run_arena(parse_config(args.config_a), parse_config(args.config_b), args.deals, args.seed, args.workers)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
@@ -0,0 +1,44 @@
+import argparse
+import json
+import sys
+
+from src.games.tarneeb.bench import (compare, format_comparison, format_report, machine_drift, merge_fastest,
+                                     run_benchmarks)
+
+BASELINE_PATH = "benchmark_baseline.json"  # Stored baseline; regenerate with -o after intended changes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Tarneeb hot paths")
+    parser.add_argument("names", nargs="*", help="Only run benchmarks whose name starts with one of these")
+    parser.add_argument("-o", "--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", nargs="?", const=BASELINE_PATH,
+                        help=f"Fail if a benchmark regressed against this JSON file (default {BASELINE_PATH})")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--retries", type=int, default=2, help="Re-runs of benchmarks that look regressed before failing")
+    parser.add_argument("--repeats", type=int, default=21, help="Timed repeats per benchmark, interleaved")
+    parser.add_argument("--min-time", type=float, default=0.02, help="Minimum seconds per repeat")
+    args = parser.parse_args()
+    
+    report = run_benchmarks(args.names, args.repeats, args.min_time)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if (baseline['python'], baseline['machine']) != (report['python'], report['machine']):
+            print(f"⚠️ Baseline is from Python {baseline['python']} on {baseline['machine']}; timings may not compare")
+        rows = compare(report, baseline, args.threshold)
+        for _ in range(args.retries):
+            # A one-off slow spell rarely hits the same benchmark on every run; a regression does
+            regressed = [row['name'] for row in rows if row['regressed']]
+            if not regressed:
+                break
+            print(f"🔁 Re-running {', '.join(regressed)}")
+            merge_fastest(report, run_benchmarks(regressed, args.repeats, args.min_time))
+            rows = compare(report, baseline, args.threshold)
+        print(format_comparison(rows, args.threshold, machine_drift(report, baseline)))
+        if any(row['regressed'] for row in rows):
+            sys.exit(1)
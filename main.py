@@ -3,28 +3,14 @@ from discord.ext import commands
 import asyncio
 import os
 import logging
-from datetime import datetime
-from pathlib import Path
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
 
-# Setup logging
-logs_dir = Path("logs")
-logs_dir.mkdir(exist_ok=True)
+from src import metrics
+from src.logging_setup import configure_logging
 
-# Create daily log files
-today = datetime.now().strftime("%Y-%m-%d")
-log_file = logs_dir / f"logs.log"
-error_file = logs_dir / f"errors.log"
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.FileHandler(error_file, level=logging.ERROR),
-        logging.StreamHandler()
-    ]
-)
+STARTED_AT = time.perf_counter()
 
 logger = logging.getLogger(__name__)
 
@@ -33,50 +19,171 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
 
+class TimedCommandTree(discord.app_commands.CommandTree):
+    """Command tree that starts the latency clock of every slash command"""
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        metrics.track_interaction(interaction, "command")
+        return True
+
 class JawakerBot(discord.Client):
     def __init__(self):
         super().__init__(intents=intents)
-        self.tree = discord.app_commands.CommandTree(self)
+        self.tree = TimedCommandTree(self)
         self.game_manager = None
+        self.message_scheduler = None
+        self.turn_timers = None
+        self.ai_pool = None
+        self.game_store = None
+        self.event_log = None
+        self.latency_task = None
+        self.reaper_task = None
+        self.watchdog = None
+        self.metrics_server = None
+        self.startup_phases: List[Tuple[str, float]] = []
+        self.ready_logged = False
         
+    @contextmanager
+    def startup_phase(self, name: str):
+        """Time one step of setup_hook for the startup report"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.startup_phases.append((name, elapsed))
+            metrics.observe(f"startup.{name}", elapsed)
+    
     async def setup_hook(self):
         """Setup bot commands and sync with Discord"""
         logger.info("🚀 Setting up bot commands...")
+        setup_start = time.perf_counter()
         
-        # Initialize game manager
-        from src.game_manager import GameManager
-        self.game_manager = GameManager()
+        with self.startup_phase("services"):
+            # Initialize game manager
+            from src.game_manager import GameManager
+            self.game_manager = GameManager()
+            
+            # All game messages go out through one rate-limited scheduler
+            from src.message_scheduler import MessageScheduler
+            self.message_scheduler = MessageScheduler()
+            self.message_scheduler.start()
+            
+            # Turn clocks of every game share one timer task
+            from src.turn_timers import TurnTimers
+            self.turn_timers = TurnTimers()
+            self.turn_timers.start()
+            
+            # Expensive bot decisions run in worker processes with a deadline
+            from src.games.tarneeb.ai_pool import AIPool
+            self.ai_pool = AIPool()
+            self.ai_pool.start()
+            
+            # Every game's moves are logged for deterministic replay
+            from src.event_log import EventLog
+            self.event_log = EventLog()
+            self.game_manager.event_log = self.event_log
         
-        # Import and setup commands
-        from src.commands.game_commands import setup_game_commands
-        from src.commands.info_commands import setup_info_commands
+        with self.startup_phase("restore"):
+            # Reload games that were running before a restart
+            from src.persistence import GameStore
+            self.game_store = GameStore()
+            await self.game_store.open()
+            await self.game_manager.restore_games(self.game_store, self)
+            self.game_manager.store = self.game_store
         
-        setup_game_commands(self.tree, self)
-        setup_info_commands(self.tree, self)
+        with self.startup_phase("monitoring"):
+            # Finished games are dropped at once; idle lobbies and stalled tables expire
+            self.reaper_task = asyncio.create_task(self.game_manager.reap_periodically(self))
+            
+            # Latency percentiles are written to the log every few minutes
+            self.latency_task = asyncio.create_task(metrics.log_latency_periodically())
+            
+            # Loop lag is measured continuously; long stalls are logged with the blocking stack
+            from src.watchdog import LoopWatchdog, configure_debug
+            configure_debug(asyncio.get_running_loop())
+            self.watchdog = LoopWatchdog()
+            self.watchdog.start()
+            
+            # Optional Prometheus endpoint (METRICS_PORT)
+            from src.metrics_server import start_metrics_server
+            self.metrics_server = await start_metrics_server(self)
         
-        # Sync commands with Discord
-        await self.tree.sync()
-        logger.info("✅ Commands synced successfully")
+        with self.startup_phase("commands"):
+            # Import and setup commands
+            from src.commands.game_commands import setup_game_commands
+            from src.commands.info_commands import setup_info_commands
+            
+            setup_game_commands(self.tree, self)
+            setup_info_commands(self.tree, self)
+        
+        with self.startup_phase("sync"):
+            # Sync commands with Discord, but only when they changed (FORCE_COMMAND_SYNC=1 always syncs)
+            from src.command_sync import sync_if_changed
+            await sync_if_changed(self.tree)
+        
+        phases = ", ".join(f"{name} {elapsed * 1000:.0f} ms" for name, elapsed in self.startup_phases)
+        logger.info(f"⏱️ Setup took {(time.perf_counter() - setup_start) * 1000:.0f} ms ({phases})")
+    
+    async def close(self):
+        """Stop background services before disconnecting"""
+        if self.latency_task:
+            self.latency_task.cancel()
+        if self.reaper_task:
+            self.reaper_task.cancel()
+        if self.watchdog:
+            self.watchdog.stop()
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        if self.message_scheduler:
+            self.message_scheduler.stop()
+        if self.turn_timers:
+            self.turn_timers.stop()
+        if self.ai_pool:
+            self.ai_pool.stop()
+        if self.game_store:
+            await self.game_store.close()
+        if self.event_log:
+            self.event_log.close()
+        await super().close()
     
     async def on_ready(self):
         """Bot ready event"""
         logger.info(f"🤖 Logged in as {self.user}")
+        if not self.ready_logged:
+            self.ready_logged = True
+            logger.info(f"⏱️ Ready {time.perf_counter() - STARTED_AT:.1f} s after start")
         await self.change_presence(activity=discord.Game(name="Jawaker Bot - Created by Hamoodi © 2025"))
     
     async def on_interaction(self, interaction: discord.Interaction):
         """Handle button interactions"""
         if interaction.type == discord.InteractionType.component:
-            # Let game manager handle the interaction
-            await self.game_manager.handle_interaction(interaction, self)
+            metrics.track_interaction(interaction, "button")
+            with metrics.timed("on_interaction"):
+                # Let game manager handle the interaction
+                await self.game_manager.handle_interaction(interaction, self)
+    
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        """Record how long a slash command took from receipt to completion"""
+        elapsed = metrics.since_received(interaction)
+        if elapsed is not None:
+            metrics.observe(f"command.{command.qualified_name}", elapsed)
 
 # Create bot instance
 bot = JawakerBot()
 
 # Run the bot
 if __name__ == "__main__":
-    token = os.getenv('DISCORD_TOKEN')
-    if not token:
-        logger.error("❌ DISCORD_TOKEN environment variable not set!")
-    else:
-        logger.info("🚀 Starting Jawaker Bot...")
-        bot.run(token) 
\ No newline at end of file
+    # Log records are written by a background thread (see src/logging_setup.py). This is set
+    # up here, not on import, because AI pool worker processes import this module too.
+    log_listener = configure_logging()
+    try:
+        token = os.getenv('DISCORD_TOKEN')
+        if not token:
+            logger.error("❌ DISCORD_TOKEN environment variable not set!")
+        else:
+            logger.info("🚀 Starting Jawaker Bot...")
+            # Our handlers already cover discord.py's loggers
+            bot.run(token, log_handler=None)
+    finally:
+        log_listener.stop() 
\ No newline at end of file
@@ -0,0 +1,62 @@
+import argparse
+import time
+
+from src.event_log import GAME_LOG_DIR, iter_logs, read_events
+from src.games.tarneeb.replay import ReplayError, describe, replay
+
+def replay_logs(paths, repeat: int = 1) -> dict:
+    """Replay every log in paths and check it, timing the replays only"""
+    logs = [(path, read_events(path)) for path in iter_logs(paths)]
+    
+    failures = {}
+    games = 0
+    events = 0
+    elapsed = 0.0
+    for _ in range(repeat):
+        for path, log in logs:
+            start = time.perf_counter()
+            try:
+                engine = replay(log)
+            except ReplayError as e:
+                failures[str(path)] = str(e)
+                continue
+            finally:
+                elapsed += time.perf_counter() - start
+            games += engine is not None
+            events += len(log)
+    
+    return {
+        'logs': len(logs),
+        'games': games,
+        'events': events,
+        'failures': failures,
+        'seconds': elapsed,
+        'events_per_second': events / elapsed if elapsed else float('inf')
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay Tarneeb event logs through the engine and check them")
+    parser.add_argument("paths", nargs="*", default=[GAME_LOG_DIR], help="Log files or directories of logs")
+    parser.add_argument("--show", action="store_true", help="Print every event and the final state of each log")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the logs this many times (for benchmarking)")
+    args = parser.parse_args()
+    
+    if args.show:
+        for path in iter_logs(args.paths):
+            log = read_events(path)
+            print(f"📜 {path}")
+            for event in log:
+                print(f"   {describe(event)}")
+            try:
+                engine = replay(log)
+            except ReplayError as e:
+                print(f"❌ {e}")
+                continue
+            if engine:
+                print(f"✅ {engine.state}, round {engine.round_number}, scores {engine.teams_scores}")
+    
+    result = replay_logs(args.paths, args.repeat)
+    print(f"🔁 Replayed {result['games']} games ({result['events']} events) in {result['seconds']:.2f}s "
+          f"- {result['events_per_second']:.0f} events/s")
+    for path, error in result['failures'].items():
+        print(f"❌ {path}: {error}")
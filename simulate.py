@@ -0,0 +1,40 @@
+import argparse
+import random
+import time
+
+from src.games.tarneeb.engine import play_game
+from src.games.tarneeb.player import AIPlayer
+
+def simulate(games: int, seed: int = None, difficulty: str = "medium") -> dict:
+    """Play complete all-bot Tarneeb games headlessly and collect totals"""
+    rng = random.Random(seed)
+    ai_players = [AIPlayer(difficulty, rng=random.Random(rng.getrandbits(32))) for _ in range(4)]
+
+    wins = [0, 0]
+    rounds = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        engine = play_game(ai_players, rng)
+        wins[engine.winning_team] += 1
+        rounds += engine.round_number
+    elapsed = time.perf_counter() - start
+
+    return {
+        'games': games,
+        'rounds': rounds,
+        'team_wins': wins,
+        'seconds': elapsed,
+        'games_per_second': games / elapsed if elapsed else float('inf')
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate all-bot Tarneeb games without Discord")
+    parser.add_argument("-n", "--games", type=int, default=1000, help="Number of 31-point games to play")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible deals and bot decisions")
+    parser.add_argument("--difficulty", default="medium", help="AIPlayer difficulty for every seat")
+    args = parser.parse_args()
+
+    result = simulate(args.games, args.seed, args.difficulty)
+    print(f"🎮 Played {result['games']} games ({result['rounds']} rounds) in {result['seconds']:.2f}s "
+          f"- {result['games_per_second']:.0f} games/s")
+    print(f"🏆 Team 1: {result['team_wins'][0]} wins | Team 2: {result['team_wins'][1]} wins")
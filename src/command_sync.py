@@ -0,0 +1,50 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Hash of the last command tree synced to Discord
+COMMAND_HASH_PATH = os.getenv("COMMAND_HASH_PATH", "data/command_tree.sha256")
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "").lower() in ("1", "true", "yes")
+
+def command_tree_hash(tree: discord.app_commands.CommandTree) -> str:
+    """Stable hash of the global command definitions as they would be sent to Discord"""
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands()), key=lambda c: (c['name'], c.get('type', 1)))
+    data = json.dumps({'application_id': tree.client.application_id, 'commands': payload},
+                      sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+def _read_hash(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+def _write_hash(path: Path, digest: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_suffix(".tmp")
+    temp.write_text(digest + "\n")
+    os.replace(temp, path)
+
+async def sync_if_changed(tree: discord.app_commands.CommandTree, path: str = COMMAND_HASH_PATH,
+                          force: bool = FORCE_COMMAND_SYNC) -> bool:
+    """Sync the command tree only if it changed since the last sync (or force is set); True if synced"""
+    digest = command_tree_hash(tree)
+    file = Path(path)
+    if not force and _read_hash(file) == digest:
+        logger.info(f"⏭️ Command tree unchanged ({digest[:12]}), skipping sync")
+        return False
+
+    await tree.sync()
+    try:
+        _write_hash(file, digest)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not save command tree hash to {file}: {e}")
+    logger.info(f"✅ Commands synced successfully ({digest[:12]})")
+    return True
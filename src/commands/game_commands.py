@@ -2,9 +2,59 @@ import discord
 import logging
 from discord import app_commands
 import asyncio
+import random
+import secrets
+import time
+
+from src.game_manager import PACES
+from src.games.tarneeb.engine import TarneebEngine, play_game
+from src.games.tarneeb.player import AIPlayer
+from src.games.tarneeb.tarneeb_game import BOT_AI_CONFIG
+from src.render_cache import STATIC_EMBEDS
 
 logger = logging.getLogger(__name__)
 
+SIMULATION_TIMEOUT = 120.0  # Longest wait for a simulated game with hard bots
+
+def build_games_embed(available_games) -> discord.Embed:
+    """Build the /games embed listing the available game types"""
+    embed = discord.Embed(
+        title="🎮 Available Games",
+        description="Here are all the games you can play:",
+        color=0x0099ff
+    )
+    
+    game_descriptions = {
+        'tarneeb': 'Syrian Tarneeb - 4-player team card game with bidding and trump selection'
+    }
+    
+    for game_type in available_games:
+        description = game_descriptions.get(game_type, f"{game_type.title()} - Card game")
+        embed.add_field(name=f"🎯 {game_type.title()}", value=description, inline=False)
+    
+    embed.add_field(name="How to Play", value="Use `/start <game_type>` to start a game", inline=False)
+    
+    return embed
+
+def play_bot_game(seed: int, difficulty: str) -> TarneebEngine:
+    """Play a whole all-bot game without pauses; seeded the way TarneebGame seeds its bots"""
+    ai_players = [AIPlayer(difficulty, BOT_AI_CONFIG['time_budget'], rng=random.Random(seed * 4 + seat))
+                  for seat in range(4)]
+    return play_game(ai_players, random.Random(seed))
+
+def build_simulation_embed(engine: TarneebEngine, difficulty: str, seed: int, seconds: float) -> discord.Embed:
+    """Build the /simulate result embed"""
+    embed = discord.Embed(
+        title="🤖 Simulated Tarneeb Game",
+        description=f"**Team {engine.winning_team + 1}** wins!",
+        color=0xffd700
+    )
+    embed.add_field(name="Final Scores", value=f"Team 1: {engine.teams_scores[0]}\nTeam 2: {engine.teams_scores[1]}", inline=True)
+    embed.add_field(name="Rounds", value=str(engine.round_number), inline=True)
+    embed.add_field(name="Bots", value=difficulty.title(), inline=True)
+    embed.set_footer(text=f"Seed {seed} • played in {seconds:.2f}s")
+    return embed
+
 def setup_game_commands(tree: discord.app_commands.CommandTree, bot):
     """Setup game-related slash commands"""
     
@@ -23,7 +73,8 @@ def setup_game_commands(tree: discord.app_commands.CommandTree, bot):
             return
         
         # Create new game
-        game = bot.game_manager.create_game(game_type, channel_id, str(interaction.user.id), interaction.user.display_name)
+        game = bot.game_manager.create_game(game_type, channel_id, str(interaction.user.id), interaction.user.display_name,
+                                            guild_id=interaction.guild_id)
         
         if not game:
             available_games = ", ".join(bot.game_manager.get_available_game_types())
@@ -64,6 +115,16 @@ def setup_game_commands(tree: discord.app_commands.CommandTree, bot):
             await interaction.response.send_message("❌ Game has already started!", ephemeral=True)
             return
         
+        # One active game per user
+        other_games = [g for g in bot.game_manager.get_user_games(str(interaction.user.id))
+                       if g is not game and g.state != "finished"]
+        if other_games:
+            await interaction.response.send_message(
+                f"❌ You're already in a game in <#{other_games[0].channel_id}>! Finish or end it first.",
+                ephemeral=True
+            )
+            return
+        
         if game.add_player(str(interaction.user.id), interaction.user.display_name):
             player_count = len(game.players)
             players_list = game.get_players_list()
@@ -89,10 +150,10 @@ def setup_game_commands(tree: discord.app_commands.CommandTree, bot):
                     if game.game_type == "tarneeb":
                         from src.games.tarneeb.game_state_embed import GameStateEmbed
                         team_embed = GameStateEmbed.create_teams_embed(game)
-                        await interaction.channel.send(embed=team_embed)
+                        bot.message_scheduler.send(interaction.channel, embed=team_embed)
                         
                         await asyncio.sleep(2)
-                        await game.continue_bidding(interaction.channel, bot)
+                        game.start_loop(interaction.channel, bot)
             else:
                 embed.add_field(name="Status", value=f"Waiting for {game.min_players-player_count} more players...", inline=False)
                 await interaction.response.send_message(embed=embed)
@@ -203,22 +264,52 @@ def setup_game_commands(tree: discord.app_commands.CommandTree, bot):
     @tree.command(name="games", description="Show all available game types")
     async def show_games(interaction: discord.Interaction):
         """Show all available game types"""
-        available_games = bot.game_manager.get_available_game_types()
-        
-        embed = discord.Embed(
-            title="🎮 Available Games",
-            description="Here are all the games you can play:",
-            color=0x0099ff
-        )
-        
-        game_descriptions = {
-            'tarneeb': 'Syrian Tarneeb - 4-player team card game with bidding and trump selection'
-        }
-        
-        for game_type in available_games:
-            description = game_descriptions.get(game_type, f"{game_type.title()} - Card game")
-            embed.add_field(name=f"🎯 {game_type.title()}", value=description, inline=False)
-        
-        embed.add_field(name="How to Play", value="Use `/start <game_type>` to start a game", inline=False)
+        available_games = tuple(bot.game_manager.get_available_game_types())
+        embed = STATIC_EMBEDS.get(("games", available_games), lambda: build_games_embed(available_games))
+        await interaction.response.send_message(embed=embed)
+    
+    @tree.command(name="pace", description="Set how long bots pause between moves in this server")
+    @app_commands.describe(speed="normal, fast, or instant (no pauses)")
+    @app_commands.choices(speed=[app_commands.Choice(name=name, value=name) for name in PACES])
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.guild_only()
+    async def set_pace(interaction: discord.Interaction, speed: str):
+        """Set the bot pacing of this server's games"""
+        bot.game_manager.set_guild_pace(interaction.guild_id, PACES[speed])
+        logger.info(f"⏩ Pace set to {speed} in guild {interaction.guild_id} by {interaction.user.display_name}")
+        await interaction.response.send_message(f"⏩ Bots now play at **{speed}** pace in this server.")
+    
+    @tree.command(name="simulate", description="Play an all-bot Tarneeb game at full speed and show the result")
+    @app_commands.describe(difficulty="Bot strength")
+    @app_commands.choices(difficulty=[app_commands.Choice(name=name, value=name) for name in ("medium", "hard")])
+    @app_commands.checks.cooldown(1, 60.0, key=lambda interaction: interaction.user.id)
+    @app_commands.checks.cooldown(5, 300.0, key=lambda interaction: interaction.guild_id)
+    async def simulate_game(interaction: discord.Interaction, difficulty: str = "medium"):
+        """Play a whole all-bot game off the event loop and post only the result"""
+        pool = getattr(bot, "ai_pool", None)
+        if difficulty == "hard" and pool is not None and pool.job_slot.locked():
+            await interaction.response.send_message("⏳ Another simulation is running, try again in a moment.", ephemeral=True)
+            return
         
-        await interaction.response.send_message(embed=embed) 
\ No newline at end of file
+        await interaction.response.defer(thinking=True)
+        seed = secrets.randbits(32)
+        start = time.perf_counter()
+        if difficulty == "hard" and pool is not None:
+            # Hard bots take hundreds of slow decisions, so the game runs in a worker process
+            engine = await pool.run_job(play_bot_game, seed, difficulty, timeout=SIMULATION_TIMEOUT)
+            if engine is None:
+                await interaction.followup.send("❌ The simulation didn't finish in time, try again later.")
+                return
+        else:
+            # In a thread the game holds the GIL against the event loop, so only cheap bots run there
+            difficulty = "medium"
+            engine = await asyncio.get_running_loop().run_in_executor(None, play_bot_game, seed, difficulty)
+        embed = build_simulation_embed(engine, difficulty, seed, time.perf_counter() - start)
+        await interaction.followup.send(embed=embed)
+    
+    @simulate_game.error
+    async def simulate_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+        if isinstance(error, app_commands.CommandOnCooldown):
+            await interaction.response.send_message(f"⏳ Try /simulate again in {error.retry_after:.0f}s.", ephemeral=True)
+            return
+        logger.error(f"❌ /simulate failed: {error}", exc_info=error) 
\ No newline at end of file
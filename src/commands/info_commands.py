@@ -2,8 +2,64 @@ import discord
 import logging
 from discord import app_commands
 
+from src.render_cache import STATIC_EMBEDS, cache_stats
+from src.metrics import format_latency, latency_stats
+
 logger = logging.getLogger(__name__)
 
+def build_rules_embed(game_type: str) -> discord.Embed:
+    """Build the /rules embed for a game type"""
+    # Game-specific rules
+    if game_type == "tarneeb":
+        embed = discord.Embed(
+            title="📋 Tarneeb Rules",
+            description="Syrian Tarneeb card game rules",
+            color=0x0099ff
+        )
+        
+        embed.add_field(
+            name="🎯 Objective",
+            value="First team to reach 31 points wins!",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="👥 Teams",
+            value="4 players in 2 teams:\n• Team 1: Players 1 & 3\n• Team 2: Players 2 & 4",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="💰 Bidding",
+            value="Players bid on how many tricks their team can win (1-7).\nHighest bidder chooses the tarneeb (trump) suit.",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🃏 Playing",
+            value="• Must follow suit if possible\n• Tarneeb (trump) cards beat all other suits\n• Highest card of led suit wins (if no trump)\n• Winner of trick leads next",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="📊 Scoring",
+            value="• If bidding team makes their bid: they get points equal to bid\n• If they fail: other team gets points equal to bid\n• First team to 31 points wins!",
+            inline=False
+        )
+    else:
+        embed = discord.Embed(
+            title="📋 Game Rules",
+            description=f"Rules for {game_type.title()}",
+            color=0x0099ff
+        )
+        embed.add_field(
+            name="Not Available",
+            value=f"Rules for {game_type.title()} are not available yet.",
+            inline=False
+        )
+    
+    return embed
+
 def setup_info_commands(tree: discord.app_commands.CommandTree, bot):
     """Setup info-related slash commands"""
     
@@ -61,55 +117,7 @@ def setup_info_commands(tree: discord.app_commands.CommandTree, bot):
                 )
                 return
         
-        # Game-specific rules
-        if game_type == "tarneeb":
-            embed = discord.Embed(
-                title="📋 Tarneeb Rules",
-                description="Syrian Tarneeb card game rules",
-                color=0x0099ff
-            )
-            
-            embed.add_field(
-                name="🎯 Objective",
-                value="First team to reach 31 points wins!",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="👥 Teams",
-                value="4 players in 2 teams:\n• Team 1: Players 1 & 3\n• Team 2: Players 2 & 4",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="💰 Bidding",
-                value="Players bid on how many tricks their team can win (1-7).\nHighest bidder chooses the tarneeb (trump) suit.",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🃏 Playing",
-                value="• Must follow suit if possible\n• Tarneeb (trump) cards beat all other suits\n• Highest card of led suit wins (if no trump)\n• Winner of trick leads next",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="📊 Scoring",
-                value="• If bidding team makes their bid: they get points equal to bid\n• If they fail: other team gets points equal to bid\n• First team to 31 points wins!",
-                inline=False
-            )
-        else:
-            embed = discord.Embed(
-                title="📋 Game Rules",
-                description=f"Rules for {game_type.title()}",
-                color=0x0099ff
-            )
-            embed.add_field(
-                name="Not Available",
-                value=f"Rules for {game_type.title()} are not available yet.",
-                inline=False
-            )
-        
+        embed = STATIC_EMBEDS.get(("rules", game_type), lambda: build_rules_embed(game_type))
         await interaction.response.send_message(embed=embed)
     
     @tree.command(name="stats", description="Show bot statistics")
@@ -136,4 +144,20 @@ def setup_info_commands(tree: discord.app_commands.CommandTree, bot):
             games_by_state = "\n".join([f"• {state.title()}: {count}" for state, count in stats['games_by_state'].items()])
             embed.add_field(name="Games by State", value=games_by_state, inline=False)
         
+        # Render cache effectiveness
+        caches = [f"• {name}: {c['hits']} hits / {c['misses']} misses ({c['hit_rate']:.0%})"
+                  for name, c in cache_stats().items() if c['hits'] or c['misses']]
+        if caches:
+            embed.add_field(name="Render Cache", value="\n".join(caches), inline=False)
+        
+        # Interaction, command, phase and send latency percentiles
+        latency = format_latency(latency_stats())
+        if latency:
+            value = ""
+            for line in latency:
+                if len(value) + len(line) + 1 > 1024:
+                    break
+                value += line + "\n"
+            embed.add_field(name="Latency", value=value, inline=False)
+        
         await interaction.response.send_message(embed=embed) 
\ No newline at end of file
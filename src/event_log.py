@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+GAME_LOG_DIR = os.getenv("GAME_LOG_DIR", "data/game_logs")
+EVENT_FLUSH_INTERVAL = int(os.getenv("GAME_LOG_FLUSH_MS", "250")) / 1000
+GAME_LOG_MAX_AGE = float(os.getenv("GAME_LOG_MAX_AGE_DAYS", "30")) * 86400  # 0 keeps logs of any age
+GAME_LOG_MAX_FILES = int(os.getenv("GAME_LOG_MAX_FILES", "10000"))  # 0 keeps any number
+PRUNE_INTERVAL = 3600  # Seconds between retention passes
+
+# One event: kind, seat (-1 for none), value
+RECORD = struct.Struct("<BbI")
+
+Event = Tuple[int, int, int]
+
+def log_path(directory: str, game_id: str) -> Path:
+    return Path(directory) / f"{game_id}.log"
+
+def read_events(path) -> List[Event]:
+    """Every event in a log file, in order (a torn last record is ignored)"""
+    data = Path(path).read_bytes()
+    end = len(data) - len(data) % RECORD.size
+    return list(RECORD.iter_unpack(data[:end]))
+
+def iter_logs(paths) -> Iterator[Path]:
+    """Log files in paths, expanding directories"""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(path.glob("*.log"))
+        else:
+            yield path
+
+class EventLog:
+    """Append-only per-game event logs, one file per game id
+    
+    Events are buffered in memory and written in batches by a single worker
+    thread, at most once per interval per game, so recording a move never
+    blocks the event loop on disk I/O. The same thread deletes logs older than
+    max_age and the oldest logs beyond max_files, at start and then hourly.
+    """
+    
+    def __init__(self, directory: str = GAME_LOG_DIR, interval: float = EVENT_FLUSH_INTERVAL,
+                 max_age: float = GAME_LOG_MAX_AGE, max_files: int = GAME_LOG_MAX_FILES):
+        self.directory = directory
+        self.interval = interval
+        self.max_age = max_age
+        self.max_files = max_files
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-log")
+        self.buffers: Dict[str, bytearray] = {}  # game_id -> events not yet written
+        self.timers: Dict[str, asyncio.TimerHandle] = {}
+        self.stats = {'events': 0, 'flushes': 0, 'failed': 0, 'pruned': 0}
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.pruned_at = time.monotonic()
+        self.executor.submit(self._prune)
+    
+    def append(self, game_id: str, kind: int, seat: int, value: int = 0):
+        """Buffer one event for game_id"""
+        buffer = self.buffers.get(game_id)
+        if buffer is None:
+            buffer = self.buffers[game_id] = bytearray()
+        buffer += RECORD.pack(kind, seat, value)
+        self.stats['events'] += 1
+        
+        if game_id not in self.timers:
+            loop = asyncio.get_running_loop()
+            self.timers[game_id] = loop.call_later(self.interval, self.flush, game_id)
+    
+    def flush(self, game_id: str):
+        """Hand game_id's buffered events to the writer thread"""
+        timer = self.timers.pop(game_id, None)
+        if timer:
+            timer.cancel()
+        data = self.buffers.pop(game_id, None)
+        if data:
+            self.executor.submit(self._write, log_path(self.directory, game_id), bytes(data))
+        if time.monotonic() - self.pruned_at >= PRUNE_INTERVAL:
+            self.pruned_at = time.monotonic()
+            self.executor.submit(self._prune)
+    
+    def _write(self, path: Path, data: bytes):
+        try:
+            with open(path, "ab") as file:
+                file.write(data)
+            self.stats['flushes'] += 1
+        except OSError as e:
+            self.stats['failed'] += 1
+            logger.error(f"❌ Failed to write event log {path}: {e}")
+    
+    def _prune(self):
+        """Delete logs past the retention limits, oldest first"""
+        if not self.max_age and not self.max_files:
+            return
+        try:
+            logs = sorted((path.stat().st_mtime, path) for path in Path(self.directory).glob("*.log"))
+        except OSError as e:
+            logger.error(f"❌ Failed to list event logs in {self.directory}: {e}")
+            return
+        
+        # Logs still being written were modified recently, so they sort last
+        expired = len(logs) - self.max_files if self.max_files else 0
+        cutoff = time.time() - self.max_age if self.max_age else float("-inf")
+        removed = 0
+        for index, (modified, path) in enumerate(logs):
+            if index >= expired and modified >= cutoff:
+                break
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                logger.warning(f"⚠️ Could not delete event log {path}: {e}")
+        if removed:
+            self.stats['pruned'] += removed
+            logger.info(f"🧹 Deleted {removed} old event log(s)")
+    
+    def close(self):
+        """Write everything still buffered and stop the writer thread"""
+        for game_id in list(self.buffers):
+            self.flush(game_id)
+        self.executor.shutdown(wait=True)
+        logger.info(f"📜 Event log closed ({self.stats['events']} events)")
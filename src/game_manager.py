@@ -1,25 +1,53 @@
+import asyncio
 import discord
 import logging
-from typing import Dict, List, Optional, Type
+import os
+import time
+from typing import Dict, List, Optional, Set, Type
 from datetime import datetime
 
 from .games.base_game import BaseGame
 from .games.tarneeb.tarneeb_game import TarneebGame
+from . import metrics
+from .logging_setup import current_game
 
 logger = logging.getLogger(__name__)
 
+# Idle games are closed after these many seconds without a move or a join (0 = never)
+LOBBY_TTL = int(os.getenv("GAME_LOBBY_TTL_S", "1800"))
+STALLED_TTL = int(os.getenv("GAME_STALLED_TTL_S", "3600"))
+REAP_INTERVAL = int(os.getenv("GAME_REAP_INTERVAL_S", "60"))
+
+# Bot pacing per guild: multipliers on the pauses between automatic steps
+PACES = {'normal': 1.0, 'fast': 0.25, 'instant': 0.0}
+DEFAULT_PACE = PACES.get(os.getenv("GAME_PACE", "normal"), 1.0)
+
 class GameManager:
     """Manages all active games across the bot"""
     
     def __init__(self):
         self.active_games: Dict[int, BaseGame] = {}  # channel_id -> game
+        self.games_by_id: Dict[str, BaseGame] = {}  # game_id -> game, for routing interactions
         self.game_types = {
             'tarneeb': TarneebGame
         }
         
+        # Secondary indexes, kept up to date as games are created, joined, change state and end
+        self.user_games: Dict[str, Set[int]] = {}  # human user_id -> channel_ids
+        self.type_games: Dict[str, Set[int]] = {}  # game_type -> channel_ids
+        self.state_games: Dict[str, Set[int]] = {}  # state -> channel_ids
+        self.total_players = 0
+        self.indexed: Dict[int, tuple] = {}  # channel_id -> (state, player count, human ids) as last indexed
+        
+        self.store = None  # GameStore for crash recovery, set by the bot
+        self.event_log = None  # EventLog for replays, set by the bot
+        self.restore_tasks: Set[asyncio.Task] = set()
+        self.guild_pace: Dict[int, float] = {}  # guild_id -> pace, for guilds that set one
+        
         logger.info("🎮 Game Manager initialized")
     
-    def create_game(self, game_type: str, channel_id: int, creator_id: str, creator_name: str) -> Optional[BaseGame]:
+    def create_game(self, game_type: str, channel_id: int, creator_id: str, creator_name: str,
+                    guild_id: Optional[int] = None) -> Optional[BaseGame]:
         """Create a new game of the specified type"""
         if game_type not in self.game_types:
             logger.error(f"❌ Unknown game type: {game_type}")
@@ -32,87 +60,238 @@ class GameManager:
         # Create the game
         game_class = self.game_types[game_type]
         game = game_class(channel_id, creator_id, creator_name)
-        self.active_games[channel_id] = game
+        game.guild_id = guild_id
+        game.pace = self.pace_for(guild_id)
+        self._register(game)
         
         logger.info(f"🎮 Created {game_type} game in channel {channel_id}")
         return game
     
+    def _register(self, game: BaseGame):
+        channel_id = game.channel_id
+        self.active_games[channel_id] = game
+        self.games_by_id[game.game_id] = game
+        self.type_games.setdefault(game.game_type, set()).add(channel_id)
+        self.indexed[channel_id] = (None, 0, frozenset())
+        self.update_index(game)
+        game.listener = self.update_index
+        game.event_log = self.event_log
+    
+    async def restore_games(self, store, bot):
+        """Reload games saved before a restart and resume the running ones"""
+        self.guild_pace.update(await store.load_guild_paces())
+        restored = 0
+        for channel_id, game_type, data in await store.load_all():
+            game_class = self.game_types.get(game_type)
+            if game_class is None or channel_id in self.active_games:
+                store.delete(channel_id)
+                continue
+            try:
+                game = game_class.restore(channel_id, data)
+            except Exception:
+                logger.exception(f"❌ Could not restore {game_type} game in channel {channel_id}")
+                store.delete(channel_id)
+                continue
+            
+            self._register(game)
+            restored += 1
+            if game.state not in ("waiting", "finished"):
+                task = asyncio.create_task(self._resume(game, bot))
+                self.restore_tasks.add(task)
+                task.add_done_callback(self.restore_tasks.discard)
+        
+        logger.info(f"💾 Restored {restored} game(s)")
+    
+    async def _resume(self, game: BaseGame, bot):
+        """Restart a restored game's loop once its channel is reachable"""
+        await bot.wait_until_ready()
+        try:
+            channel = bot.get_channel(game.channel_id) or await bot.fetch_channel(game.channel_id)
+        except discord.HTTPException as e:
+            logger.warning(f"⚠️ Dropping restored game in channel {game.channel_id}: {e}")
+            self.end_game(game.channel_id, "Channel unavailable after restart")
+            return
+        
+        game.guild_id = getattr(getattr(channel, "guild", None), "id", None)
+        game.pace = self.pace_for(game.guild_id)
+        game.start_loop(channel, bot)
+        logger.info(f"▶️ Resumed {game.game_type} game in channel {game.channel_id}")
+    
+    def update_index(self, game: BaseGame):
+        """Re-index one game after its state or players changed"""
+        channel_id = game.channel_id
+        if self.active_games.get(channel_id) is not game:
+            return
+        
+        old_state, old_count, old_humans = self.indexed[channel_id]
+        state = game.state
+        if state != old_state:
+            if old_state is not None:
+                self._discard(self.state_games, old_state, channel_id)
+            self.state_games.setdefault(state, set()).add(channel_id)
+        
+        count = len(game.players)
+        self.total_players += count - old_count
+        # Compared as a set so a human replaced by a bot leaves the index though the count is unchanged
+        humans = frozenset(player['id'] for player in game.players if not player.get('is_bot', False))
+        if humans != old_humans:
+            for user_id in old_humans - humans:
+                self._discard(self.user_games, user_id, channel_id)
+            for user_id in humans - old_humans:
+                self.user_games.setdefault(user_id, set()).add(channel_id)
+        
+        self.indexed[channel_id] = (state, count, humans)
+        
+        # Finished games are let go right away; the game's loop finishes on its own
+        if state == "finished":
+            self._evict(game, "finished")
+        elif self.store is not None:
+            self.store.save(game)
+    
+    def _remove_from_index(self, game: BaseGame):
+        channel_id = game.channel_id
+        state, count, humans = self.indexed.pop(channel_id)
+        self._discard(self.state_games, state, channel_id)
+        self._discard(self.type_games, game.game_type, channel_id)
+        for user_id in humans:
+            self._discard(self.user_games, user_id, channel_id)
+        self.total_players -= count
+        game.listener = None
+        if self.store is not None:
+            self.store.delete(channel_id)
+        if self.event_log is not None:
+            self.event_log.flush(game.game_id)
+    
+    @staticmethod
+    def _discard(index: Dict[str, Set[int]], key: str, channel_id: int):
+        channels = index.get(key)
+        if channels is not None:
+            channels.discard(channel_id)
+            if not channels:
+                del index[key]
+    
+    def pace_for(self, guild_id: Optional[int]) -> float:
+        """Pacing multiplier for games in a guild"""
+        return self.guild_pace.get(guild_id, DEFAULT_PACE)
+    
+    def set_guild_pace(self, guild_id: int, pace: float):
+        """Change a guild's pacing, including the games already running there"""
+        self.guild_pace[guild_id] = pace
+        if self.store is not None:
+            self.store.save_guild_pace(guild_id, pace)
+        for game in self.active_games.values():
+            if game.guild_id == guild_id:
+                game.pace = pace
+    
     def get_game(self, channel_id: int) -> Optional[BaseGame]:
         """Get game by channel ID"""
         return self.active_games.get(channel_id)
     
-    def end_game(self, channel_id: int, reason: str = "Game ended") -> bool:
-        """End a game in the specified channel"""
-        if channel_id not in self.active_games:
+    def end_game(self, channel_id: int, reason: str = "Game ended", cause: str = "ended") -> bool:
+        """End a game in the specified channel; cause labels the games_evicted_* counter"""
+        game = self.active_games.get(channel_id)
+        if game is None:
             return False
         
-        game = self.active_games[channel_id]
+        self._evict(game, cause)
         game.end_game(reason)
-        del self.active_games[channel_id]
         
         logger.info(f"🏁 Ended game in channel {channel_id}: {reason}")
         return True
     
+    def _evict(self, game: BaseGame, cause: str):
+        """Drop every reference the manager holds to game and let it release its views"""
+        channel_id = game.channel_id
+        if self.active_games.get(channel_id) is not game:
+            return
+        
+        del self.active_games[channel_id]
+        self.games_by_id.pop(game.game_id, None)
+        self._remove_from_index(game)
+        game.release()
+        metrics.increment(f"games_evicted_{cause}")
+        logger.debug(f"🧹 Evicted {game.game_type} game in channel {channel_id} ({cause})")
+    
     def get_active_games_count(self) -> int:
         """Get total number of active games"""
         return len(self.active_games)
     
     def get_games_by_type(self, game_type: str) -> List[BaseGame]:
         """Get all active games of a specific type"""
-        return [game for game in self.active_games.values() if game.game_type == game_type]
+        return [self.active_games[channel_id] for channel_id in self.type_games.get(game_type, ())]
     
     def get_user_games(self, user_id: str) -> List[BaseGame]:
         """Get all games where user is a player"""
-        user_games = []
-        for game in self.active_games.values():
-            if game.is_player_in_game(user_id):
-                user_games.append(game)
-        return user_games
+        return [self.active_games[channel_id] for channel_id in self.user_games.get(str(user_id), ())]
     
     def cleanup_finished_games(self):
         """Clean up games that have finished"""
-        finished_channels = []
-        for channel_id, game in self.active_games.items():
-            if game.state == "finished":
-                finished_channels.append(channel_id)
+        finished_channels = list(self.state_games.get("finished", ()))
         
         for channel_id in finished_channels:
-            del self.active_games[channel_id]
+            self._evict(self.active_games[channel_id], "finished")
             logger.info(f"🧹 Cleaned up finished game in channel {channel_id}")
     
+    def reap_idle_games(self, bot) -> int:
+        """Close lobbies and tables that have been idle past their TTL; returns how many"""
+        self.cleanup_finished_games()
+        
+        now = time.monotonic()
+        expired = []
+        for channel_id, game in self.active_games.items():
+            idle = now - game.last_activity
+            if game.state == "waiting":
+                if LOBBY_TTL and idle > LOBBY_TTL:
+                    expired.append((channel_id, "idle_lobby", idle))
+            elif STALLED_TTL and idle > STALLED_TTL:
+                expired.append((channel_id, "stalled", idle))
+        
+        for channel_id, cause, idle in expired:
+            minutes = int(idle // 60)
+            channel = bot.get_channel(channel_id)
+            if channel is not None and bot.message_scheduler is not None:
+                what = "lobby" if cause == "idle_lobby" else "game"
+                bot.message_scheduler.send(channel, f"⌛ This {what} was closed after {minutes} minutes without activity.")
+            self.end_game(channel_id, f"No activity for {minutes} minutes", cause)
+        
+        if expired:
+            logger.info(f"🧹 Closed {len(expired)} idle game(s)")
+        return len(expired)
+    
+    async def reap_periodically(self, bot, interval: float = REAP_INTERVAL):
+        """Run reap_idle_games for every game every interval seconds"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.reap_idle_games(bot)
+            except Exception:
+                logger.exception("❌ Idle game reaper failed")
+    
     def get_game_stats(self) -> Dict:
         """Get statistics about active games"""
-        stats = {
+        return {
             'total_games': len(self.active_games),
-            'games_by_type': {},
-            'games_by_state': {},
-            'total_players': 0
+            'games_by_type': {game_type: len(channels) for game_type, channels in self.type_games.items()},
+            'games_by_state': {state: len(channels) for state, channels in self.state_games.items()},
+            'total_players': self.total_players
         }
-        
-        for game in self.active_games.values():
-            # Count by type
-            game_type = game.game_type
-            stats['games_by_type'][game_type] = stats['games_by_type'].get(game_type, 0) + 1
-            
-            # Count by state
-            state = game.state
-            stats['games_by_state'][state] = stats['games_by_state'].get(state, 0) + 1
-            
-            # Count total players
-            stats['total_players'] += len(game.players)
-        
-        return stats
     
     async def handle_interaction(self, interaction: discord.Interaction, bot) -> bool:
         """Handle Discord UI interactions for all games"""
-        channel_id = interaction.channel.id
-        game = self.get_game(channel_id)
+        # Buttons carry the id of the game that created them
+        route = BaseGame.parse_custom_id(interaction.data.get("custom_id", ""))
+        if route is None:
+            return False
         
+        game = self.games_by_id.get(route[0])
         if not game:
-            return False
+            await interaction.response.send_message("⌛ This game is no longer running!", ephemeral=True)
+            return True
         
         # Try to handle the interaction
-        return await game.handle_interaction(interaction, bot)
+        current_game.set(game)
+        with metrics.timed("game.handle_interaction"):
+            return await game.handle_interaction(interaction, bot)
     
     def get_available_game_types(self) -> List[str]:
         """Get list of available game types"""
@@ -129,4 +308,4 @@ class GameManager:
         if not game:
             return None
         
-        return game.get_game_info() 
\ No newline at end of file
+        return game.get_game_info()
@@ -1,7 +1,9 @@
 import discord
 import logging
+import secrets
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -14,11 +16,17 @@ class BaseGame(ABC):
         self.creator_id = creator_id
         self.creator_name = creator_name
         self.game_type = game_type
+        self.game_id = secrets.token_hex(4)  # Scopes the custom_ids of this game's buttons
         self.state = "waiting"  # waiting, playing, finished
         self.created_at = datetime.now()
+        self.last_activity = time.monotonic()  # Last change of state or players, for idle expiry
         self.players: List[Dict] = []
         self.max_players = 4
         self.min_players = 2
+        self.listener: Optional[Callable[["BaseGame"], None]] = None  # Set by GameManager to keep its indexes current
+        self.event_log = None  # EventLog for replays, set by GameManager
+        self.guild_id: Optional[int] = None
+        self.pace = 1.0  # Multiplier on pacing pauses (0 = no pauses), set per guild by GameManager
         
         logger.info(f"🎮 Created new {game_type} game in channel {channel_id} by {creator_name}")
     
@@ -47,6 +55,42 @@ class BaseGame(ABC):
         """Handle Discord UI interactions"""
         pass
     
+    def snapshot(self) -> Optional[bytes]:
+        """Binary snapshot for crash recovery, None if this game type isn't persisted"""
+        return None
+    
+    @classmethod
+    def restore(cls, channel_id: int, data: bytes) -> "BaseGame":
+        """Rebuild a game from snapshot() output"""
+        raise NotImplementedError(f"{cls.__name__} does not support snapshots")
+    
+    def record_event(self, kind: int, seat: int, value: int = 0):
+        """Append one event to this game's replay log"""
+        if self.event_log is not None:
+            self.event_log.append(self.game_id, kind, seat, value)
+    
+    def notify_change(self):
+        """Tell the game manager that the state or players changed"""
+        self.last_activity = time.monotonic()
+        if self.listener:
+            self.listener(self)
+    
+    def release(self):
+        """Stop background work and drop views once the game manager has let go of the game"""
+        pass
+    
+    @staticmethod
+    def parse_custom_id(custom_id: str) -> Optional[Tuple[str, int, int, str, str]]:
+        """Split a "game_id:round:nonce:action[:arg]" custom_id, None if it isn't one"""
+        parts = custom_id.split(":", 4)
+        if len(parts) < 4:
+            return None
+        try:
+            round_number, nonce = int(parts[1]), int(parts[2])
+        except ValueError:
+            return None
+        return parts[0], round_number, nonce, parts[3], parts[4] if len(parts) == 5 else ""
+    
     def get_player(self, user_id: str) -> Optional[Dict]:
         """Get player by user ID"""
         return next((p for p in self.players if p['id'] == user_id), None)
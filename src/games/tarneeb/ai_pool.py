@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from ... import metrics
+from .engine import TarneebEngine
+from .player import AIPlayer
+
+logger = logging.getLogger(__name__)
+
+AI_POOL_WORKERS = int(os.getenv("AI_POOL_WORKERS", str(min(2, os.cpu_count() or 1))))
+AI_DECISION_DEADLINE = int(os.getenv("AI_DECISION_DEADLINE_MS", "1000")) / 1000
+WARM_UP_TIMEOUT = 60.0  # Longest wait for fresh workers to import the bot's modules
+
+# Decision kinds: "bid" returns the bid (0 = pass), "trump" a suit symbol, "card" a card id
+def decide(kind: str, engine: TarneebEngine, seat: int, ai: AIPlayer):
+    """The AI's decision for seat in engine's current state"""
+    if kind == "bid":
+        return ai.make_bid_decision(engine.hands[seat], engine.current_bid, engine.passes_count, seat)
+    if kind == "trump":
+        return ai.choose_tarneeb_suit(engine.hands[seat])
+    return ai.choose_card_for_seat(engine, seat)
+
+def _decide_serialized(kind: str, state: bytes, seat: int, difficulty: str, time_budget: float, seed: int):
+    """Worker side of AIPool.decide: rebuild the engine and AI from their compact form"""
+    engine = TarneebEngine.from_bytes(state, random.Random(0))
+    return decide(kind, engine, seat, AIPlayer(difficulty, time_budget, rng=random.Random(seed)))
+
+def _warm_up() -> int:
+    return os.getpid()
+
+class AIPool:
+    """Runs expensive AI decisions in worker processes, each with a hard deadline
+
+    Workers get the engine as to_bytes() output plus the AI's settings and a seed
+    drawn from its rng, never live game objects. A decision that misses the
+    deadline (or fails) returns None so the caller can fall back to a heuristic.
+    Cancelling the awaiting task, as ending a game does, drops work still queued.
+    Decisions wait for freshly started workers before their deadline starts, so
+    start-up time never counts against it.
+    """
+
+    def __init__(self, workers: int = AI_POOL_WORKERS, deadline: float = AI_DECISION_DEADLINE):
+        self.workers = workers
+        self.deadline = deadline
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.warming: List[Future] = []  # Warm-up calls of workers that haven't started yet
+        self.pending = 0  # Decisions submitted and not yet answered
+        self.stats = {'decided': 0, 'missed_deadline': 0, 'failed': 0, 'cancelled': 0}
+        self.job_slot = asyncio.Lock()  # Long jobs run one at a time, leaving workers for live games
+
+    def start(self):
+        """Start the workers and warm them up in the background"""
+        # Spawned workers don't inherit the bot's threads, sockets or database handles
+        context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self.warming = [self.executor.submit(_warm_up) for _ in range(self.workers)]
+        logger.info(f"🧠 AI pool started with {self.workers} worker(s), {self.deadline * 1000:.0f} ms deadline")
+
+    def _restart(self):
+        """Replace a pool whose worker died; decisions in flight on it have already failed"""
+        logger.error("❌ An AI worker died, restarting the AI pool")
+        self.stop()
+        self.start()
+
+    def stop(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def wait_until_warm(self):
+        """Wait for the workers to start and import the bot's modules (a few seconds when spawned)"""
+        warming = self.warming
+        start = time.perf_counter()
+        try:
+            # A failed warm-up shows up again as BrokenProcessPool on the next submit
+            await asyncio.wait_for(asyncio.gather(*map(asyncio.wrap_future, warming), return_exceptions=True),
+                                   WARM_UP_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ AI workers still starting after {WARM_UP_TIMEOUT:.0f} s")
+        if self.warming is warming:
+            self.warming = []
+            logger.info(f"🧠 AI pool ready after {time.perf_counter() - start:.1f} s")
+
+    async def decide(self, kind: str, engine: TarneebEngine, seat: int, ai: AIPlayer):
+        """Decision from a worker, or None if it missed the deadline or failed"""
+        if self.warming:
+            await self.wait_until_warm()
+        try:
+            future = self.executor.submit(_decide_serialized, kind, engine.to_bytes(), seat, ai.difficulty,
+                                          ai.time_budget, ai.rng.getrandbits(32))
+        except BrokenProcessPool:
+            self._restart()
+            self.stats['failed'] += 1
+            return None
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            decision = await asyncio.wait_for(asyncio.wrap_future(future), self.deadline)
+            self.stats['decided'] += 1
+            return decision
+        except asyncio.TimeoutError:
+            self.stats['missed_deadline'] += 1
+            metrics.increment("ai_deadline_missed")
+            logger.warning(f"⏱️ AI {kind} decision missed its {self.deadline * 1000:.0f} ms deadline")
+            return None
+        except asyncio.CancelledError:
+            self.stats['cancelled'] += 1
+            raise
+        except BrokenProcessPool:
+            self._restart()
+            self.stats['failed'] += 1
+            return None
+        except Exception:
+            self.stats['failed'] += 1
+            logger.exception(f"❌ AI {kind} decision failed in the pool")
+            return None
+        finally:
+            # Only drops work no worker has picked up yet: a decision already running is not
+            # interrupted and keeps its worker busy until it finishes, holding up later decisions
+            future.cancel()
+            self.pending -= 1
+            metrics.observe(f"ai.pool.{kind}", time.perf_counter() - start)
+
+    async def run_job(self, func, *args, timeout: float):
+        """Run a long job, such as a whole simulated game, on a worker; None if it timed out or failed
+
+        A job that times out is not interrupted: it keeps its worker until it finishes.
+        """
+        async with self.job_slot:
+            if self.warming:
+                await self.wait_until_warm()
+            try:
+                future = self.executor.submit(func, *args)
+            except BrokenProcessPool:
+                self._restart()
+                return None
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ AI pool job {func.__name__} ran past {timeout:.0f} s")
+                return None
+            except BrokenProcessPool:
+                self._restart()
+                return None
+            except Exception:
+                logger.exception(f"❌ AI pool job {func.__name__} failed")
+                return None
+            finally:
+                future.cancel()
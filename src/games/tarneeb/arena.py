@@ -0,0 +1,198 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .engine import TarneebEngine, play_game
+from .player import AIPlayer
+
+# AIPlayer methods whose latency is recorded
+TIMED_DECISIONS = ("make_bid_decision", "choose_tarneeb_suit", "choose_card_for_seat")
+
+def parse_config(spec: str) -> Dict:
+    """Parse 'difficulty[:key=value,...]' into AIPlayer keyword arguments"""
+    difficulty, _, options = spec.partition(":")
+    config = {'difficulty': difficulty or "medium"}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        for cast in (int, float):
+            try:
+                value = cast(value)
+                break
+            except ValueError:
+                continue
+        config[key.strip()] = value
+    return config
+
+class TimedAI:
+    """Wraps an AIPlayer and records the latency of every decision in nanoseconds"""
+
+    def __init__(self, ai_player: AIPlayer, samples: Dict[str, List[int]]):
+        self.ai_player = ai_player
+        self.samples = samples
+
+    def _timed(self, name: str, *args):
+        start = time.perf_counter_ns()
+        result = getattr(self.ai_player, name)(*args)
+        self.samples[name].append(time.perf_counter_ns() - start)
+        return result
+
+    def make_bid_decision(self, *args):
+        return self._timed("make_bid_decision", *args)
+
+    def choose_tarneeb_suit(self, *args):
+        return self._timed("choose_tarneeb_suit", *args)
+
+    def choose_card_for_seat(self, *args):
+        return self._timed("choose_card_for_seat", *args)
+
+def _empty_totals() -> Dict:
+    return {
+        'games': 0,
+        'wins': 0,
+        'rounds': 0,
+        'points': 0,
+        'bids': 0,
+        'bids_made': 0,
+        'points_per_round': [],  # Per game, for the confidence interval
+        'latency': {'a': {name: [] for name in TIMED_DECISIONS}, 'b': {name: [] for name in TIMED_DECISIONS}}
+    }
+
+def play_deals(config_a: Dict, config_b: Dict, seeds: Sequence[int]) -> Dict:
+    """Play every seed twice with seats swapped and total the results for config A"""
+    totals = _empty_totals()
+    latency = totals['latency']
+
+    for seed in seeds:
+        # Same seed twice: A sits in seats 0 & 2, then in seats 1 & 3
+        for a_team in (0, 1):
+            ai_a = TimedAI(AIPlayer(**config_a, rng=random.Random(seed)), latency['a'])
+            ai_b = TimedAI(AIPlayer(**config_b, rng=random.Random(seed)), latency['b'])
+            seats = [ai_a, ai_b, ai_a, ai_b] if a_team == 0 else [ai_b, ai_a, ai_b, ai_a]
+
+            engine = play_game(seats, engine=TarneebEngine(random.Random(seed)))
+
+            a_points = 0
+            for result in engine.round_history:
+                if result['scoring_team'] == a_team:
+                    a_points += result['points']
+                if result['bidding_team'] == a_team:
+                    totals['bids'] += 1
+                    totals['bids_made'] += result['bid_made']
+
+            rounds = len(engine.round_history)
+            totals['games'] += 1
+            totals['wins'] += engine.winning_team == a_team
+            totals['rounds'] += rounds
+            totals['points'] += a_points
+            totals['points_per_round'].append(a_points / rounds)
+
+    return totals
+
+def _merge(totals: Dict, part: Dict):
+    for key in ('games', 'wins', 'rounds', 'points', 'bids', 'bids_made'):
+        totals[key] += part[key]
+    totals['points_per_round'].extend(part['points_per_round'])
+    for side in ('a', 'b'):
+        for name in TIMED_DECISIONS:
+            totals['latency'][side][name].extend(part['latency'][side][name])
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> Tuple[float, float]:
+    """95% Wilson score interval for a proportion"""
+    if not trials:
+        return (0.0, 0.0)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return (centre - margin, centre + margin)
+
+def mean_interval(values: List[float], z: float = 1.96) -> Tuple[float, float, float]:
+    """Mean with a normal-approximation 95% confidence interval"""
+    if not values:
+        return (0.0, 0.0, 0.0)
+    mean = sum(values) / len(values)
+    if len(values) < 2:
+        return (mean, mean, mean)
+    variance = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+    margin = z * math.sqrt(variance / len(values))
+    return (mean, mean - margin, mean + margin)
+
+def percentiles(samples: List[int], points: Sequence[float] = (50, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles of nanosecond samples, in microseconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {}
+    for point in points:
+        index = min(len(ordered) - 1, max(0, math.ceil(point / 100 * len(ordered)) - 1))
+        result[f"p{point:g}"] = ordered[index] / 1000
+    result['max'] = ordered[-1] / 1000
+    result['count'] = len(ordered)
+    return result
+
+def run_arena(config_a: Dict, config_b: Dict, deals: int, seed: Optional[int] = None,
+              workers: Optional[int] = None) -> Dict:
+    """Play duplicate deals between two AI configurations across a process pool"""
+    workers = workers or os.cpu_count() or 1
+    seeds = random.Random(seed).sample(range(2 ** 31), deals)
+    chunk_size = max(1, math.ceil(deals / (workers * 4)))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, deals, chunk_size)]
+
+    totals = _empty_totals()
+    start = time.perf_counter()
+    if workers == 1:
+        for chunk in chunks:
+            _merge(totals, play_deals(config_a, config_b, chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(play_deals, [config_a] * len(chunks), [config_b] * len(chunks), chunks):
+                _merge(totals, part)
+    elapsed = time.perf_counter() - start
+
+    win_low, win_high = wilson_interval(totals['wins'], totals['games'])
+    bid_low, bid_high = wilson_interval(totals['bids_made'], totals['bids'])
+    ppr, ppr_low, ppr_high = mean_interval(totals['points_per_round'])
+
+    return {
+        'config_a': config_a,
+        'config_b': config_b,
+        'deals': deals,
+        'games': totals['games'],
+        'rounds': totals['rounds'],
+        'workers': workers,
+        'seconds': elapsed,
+        'win_rate': totals['wins'] / totals['games'] if totals['games'] else 0.0,
+        'win_rate_ci': [win_low, win_high],
+        'points_per_round': ppr,
+        'points_per_round_ci': [ppr_low, ppr_high],
+        'bid_success_rate': totals['bids_made'] / totals['bids'] if totals['bids'] else 0.0,
+        'bid_success_rate_ci': [bid_low, bid_high],
+        'latency_us': {
+            side: {name: percentiles(samples) for name, samples in decisions.items()}
+            for side, decisions in totals['latency'].items()
+        }
+    }
+
+def format_report(report: Dict) -> str:
+    """Human-readable arena report"""
+    lines = [
+        f"⚔️ A={report['config_a']} vs B={report['config_b']}",
+        f"🃏 {report['deals']} duplicate deals, {report['games']} games, {report['rounds']} rounds "
+        f"in {report['seconds']:.1f}s on {report['workers']} workers",
+        f"🏆 A win rate: {report['win_rate']:.1%} (95% CI {report['win_rate_ci'][0]:.1%} - {report['win_rate_ci'][1]:.1%})",
+        f"📊 A points/round: {report['points_per_round']:.2f} "
+        f"(95% CI {report['points_per_round_ci'][0]:.2f} - {report['points_per_round_ci'][1]:.2f})",
+        f"💰 A bid success: {report['bid_success_rate']:.1%} "
+        f"(95% CI {report['bid_success_rate_ci'][0]:.1%} - {report['bid_success_rate_ci'][1]:.1%})",
+    ]
+    for side in ('a', 'b'):
+        for name, stats in report['latency_us'][side].items():
+            if stats:
+                lines.append(
+                    f"⏱️ {side.upper()} {name}: p50 {stats['p50']:.1f}µs | p95 {stats['p95']:.1f}µs | "
+                    f"p99 {stats['p99']:.1f}µs | max {stats['max']:.1f}µs ({stats['count']} calls)"
+                )
+    return "\n".join(lines)
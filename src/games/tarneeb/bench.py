@@ -0,0 +1,433 @@
+import asyncio
+import gc
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import cards, hand_eval, monte_carlo
+from .solver import DoubleDummySolver, brute_force
+from .card_ui import CardUI, HAND_TEXT
+from .engine import TarneebEngine
+from .game_state_embed import GameStateEmbed
+from .player import AIPlayer
+from .tarneeb_game import TarneebGame
+from ...message_scheduler import MessageScheduler
+
+# Benchmark name -> setup returning (function to time, operations per call)
+Setup = Callable[[], Tuple[Callable[[], object], int]]
+BENCHMARKS: Dict[str, Setup] = {}
+TOLERANCES: Dict[str, float] = {}  # Benchmark name -> allowed slowdown, for ones noisier than the default threshold
+
+SEED = 1234
+SCOPE = "bench0000:1:1"
+MICRO_TOLERANCE = 0.35  # Calls of a few microseconds swing more with caches and CPU clocks
+MIN_DRIFT_SAMPLES = 5
+
+def benchmark(name: str, tolerance: Optional[float] = None):
+    """Register a benchmark setup under name, optionally with its own regression tolerance"""
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        if tolerance is not None:
+            TOLERANCES[name] = tolerance
+        return setup
+    return register
+
+def time_calls(func: Callable[[], object], number: int) -> float:
+    """Seconds for number calls of func, with garbage collection paused as timeit does"""
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if collecting:
+            gc.enable()
+
+def calibrate(func: Callable[[], object], min_time: float) -> int:
+    """Calls per repeat: doubled until one repeat takes min_time"""
+    number = 1
+    while time_calls(func, number) < min_time:
+        number *= 2
+    return number
+
+def summarize(timings: List[float], number: int, ops: int) -> Dict:
+    per_op = sorted(t / number / ops * 1e9 for t in timings)
+    return {
+        'median_ns': statistics.median(per_op),
+        'min_ns': per_op[0],
+        'max_ns': per_op[-1],
+        'calls': number * len(timings),
+        'ops_per_call': ops
+    }
+
+def _started_game() -> TarneebGame:
+    """All-bot game with a fixed seed, dealt and ready to bid"""
+    game = TarneebGame(0, "bench", "bench")
+    game.seed = SEED
+    game.engine.rng.seed(SEED)
+    game.start_game()
+    return game
+
+def _play_until(engine: TarneebEngine, done: Callable[[TarneebEngine], bool]) -> TarneebEngine:
+    """Advance engine with medium bots until done(engine)"""
+    ai = AIPlayer("medium", rng=random.Random(SEED))
+    while not done(engine):
+        if engine.state == "bidding":
+            seat = engine.bidding_turn
+            value = ai.make_bid_decision(engine.hands[seat], engine.current_bid, engine.passes_count, seat)
+            engine.bid(seat, value) if value else engine.pass_bid(seat)
+        elif engine.state == "tarneeb_selection":
+            seat = engine.highest_bidder
+            engine.choose_trump(seat, cards.SUIT_INDEX[ai.choose_tarneeb_suit(engine.hands[seat])])
+        else:
+            seat = engine.current_turn
+            engine.play(seat, ai.choose_card_for_seat(engine, seat))
+    return engine
+
+def _mid_trick_game() -> TarneebGame:
+    """Game in the playing phase with three cards of the third trick on the table"""
+    game = _started_game()
+    _play_until(game.engine, lambda e: e.state == "playing" and sum(e.tricks_won) == 2 and len(e.trick) == 3)
+    game._sync_hands()
+    return game
+
+# Engine and card primitives
+@benchmark("engine.deal_cards", MICRO_TOLERANCE)
+def _deal_cards():
+    game = _started_game()
+    return game.deal_cards, 1
+
+@benchmark("engine.end_trick", MICRO_TOLERANCE)
+def _end_trick():
+    engine = _mid_trick_game().engine
+    seat = engine.current_turn
+    card = cards.lowest(engine.legal_cards(seat))
+    
+    def complete_trick():
+        engine.copy().play(seat, card)
+    return complete_trick, 1
+
+@benchmark("cards.trick_winner", MICRO_TOLERANCE)
+def _trick_winner():
+    trick = [cards.card_id(card) for card in (("10", "♠"), ("K", "♠"), ("2", "♥"), ("A", "♠"))]
+    return lambda: cards.trick_winner(trick, cards.SUIT_INDEX["♥"]), 1
+
+@benchmark("player.remove_card", MICRO_TOLERANCE)
+def _remove_card():
+    game = _started_game()
+    player = game.player_objects[0]
+    mask = player.mask
+    hand = player.hand
+    
+    def remove_all():
+        for card in hand:
+            player.remove_card(card)
+        player.mask = mask
+    return remove_all, len(hand)
+
+@benchmark("player.has_suit", MICRO_TOLERANCE)
+def _has_suit():
+    player = _started_game().player_objects[0]
+    
+    def check_suits():
+        for suit in cards.SUITS:
+            player.has_suit(suit)
+    return check_suits, len(cards.SUITS)
+
+# Hand evaluation, per hand: the batch evaluator against one hand at a time
+def _random_hands(count: int) -> List[int]:
+    rng = random.Random(SEED)
+    return [sum(1 << card for card in rng.sample(range(52), 13)) for _ in range(count)]
+
+@benchmark("hand_eval.scalar")
+def _hand_eval_scalar():
+    masks = _random_hands(1000)
+    
+    def evaluate():
+        for mask in masks:
+            strength = hand_eval.hand_strength(mask)
+            hand_eval.best_trump(mask)
+            hand_eval.opening_bid_range(strength)
+    return evaluate, len(masks)
+
+@benchmark("hand_eval.batch")
+def _hand_eval_batch():
+    masks = _random_hands(1000)
+    return lambda: hand_eval.evaluate_hands(hand_eval.masks_to_array(masks)), len(masks)
+
+# AI decisions
+@benchmark("ai.make_bid_decision", MICRO_TOLERANCE)
+def _make_bid_decision():
+    game = _started_game()
+    ai = game.player_objects[1].ai_player
+    hand = game.engine.hands[1]
+    return lambda: ai.make_bid_decision(hand, 3, 1, 1), 1
+
+@benchmark("ai.choose_tarneeb_suit", MICRO_TOLERANCE)
+def _choose_tarneeb_suit():
+    game = _started_game()
+    ai = game.player_objects[1].ai_player
+    hand = game.engine.hands[1]
+    return lambda: ai.choose_tarneeb_suit(hand), 1
+
+@benchmark("ai.choose_card_to_play", MICRO_TOLERANCE)
+def _choose_card_to_play():
+    game = _mid_trick_game()
+    player = game.player_objects[game.engine.current_turn]
+    played = [cards.card_tuple(card) for card in game.engine.trick_cards()]
+    return lambda: player.ai_player.choose_card_to_play(player.hand, game.lead_suit, game.tarneeb_suit, played), 1
+
+@benchmark("ai.choose_card_for_seat", MICRO_TOLERANCE)
+def _choose_card_for_seat():
+    engine = _mid_trick_game().engine
+    ai = AIPlayer("medium", rng=random.Random(SEED))
+    seat = engine.current_turn
+    return lambda: ai.choose_card_for_seat(engine, seat), 1
+
+@benchmark("ai.monte_carlo_100_samples")
+def _monte_carlo():
+    game = _started_game()
+    engine = _play_until(game.engine, lambda e: e.state == "playing")
+    ai = AIPlayer("hard", rng=random.Random(SEED))
+    seat = engine.current_turn
+    return lambda: monte_carlo.choose_card(engine, seat, ai.choose_card, float("inf"), ai.rng, max_samples=100), 1
+
+def _solver_position(tricks: int) -> Callable[[], object]:
+    """Solve of a seeded position with tricks left to play, on a fresh table every call"""
+    engine = _play_until(_started_game().engine, lambda e: e.state == "playing" and not e.trick
+                         and cards.popcount(e.hands[e.current_turn]) == tricks)
+    hands = list(engine.hands)
+    return lambda: DoubleDummySolver(engine.trump).solve(hands, (), engine.current_turn)
+
+def check_solver(positions: int = 300, seed: int = SEED):
+    """Compare the solver with brute force on small random positions, some of them mid-trick"""
+    rng = random.Random(seed)
+    for _ in range(positions):
+        tricks = rng.randint(1, 3)
+        suits = rng.sample(range(4), rng.choice((2, 3)))  # Few suits, so following suit matters
+        deck = rng.sample([card for card in range(52) if card // 13 in suits], 4 * tricks)
+        hands = [sum(1 << card for card in deck[seat::4]) for seat in range(4)]
+        trump = rng.choice((None, 0, 1, 2, 3))
+        leader = rng.randrange(4)
+        trick = []
+        for offset in range(rng.randrange(4)):
+            seat = (leader + offset) % 4
+            legal = cards.legal_mask(hands[seat], trick[0][1] // 13 if trick else None)
+            card = rng.choice(cards.mask_cards(legal))
+            hands[seat] ^= 1 << card
+            trick.append((seat, card))
+        turn = (leader + len(trick)) % 4
+        expected = brute_force(hands, trump, trick, turn)
+        solved = DoubleDummySolver(trump).solve(hands, trick, turn)
+        if solved != expected:
+            raise AssertionError(f"solver gave {solved}, brute force {expected} for hands {hands}, "
+                                 f"trump {trump}, trick {trick}, turn {turn}")
+
+# The solver is only fast enough for endgames; raising ENDGAME_TRICKS shows up here first
+@benchmark("solver.endgame")
+def _solver_endgame():
+    check_solver()
+    return _solver_position(monte_carlo.ENDGAME_TRICKS), 1
+
+@benchmark("solver.7_tricks")
+def _solver_7_tricks():
+    return _solver_position(7), 1
+
+# Rendering
+@benchmark("ui.format_hand", MICRO_TOLERANCE)
+def _format_hand():
+    hand = _started_game().player_objects[0].hand
+    return lambda: CardUI.format_hand(hand), 1
+
+@benchmark("ui.format_hand_uncached", MICRO_TOLERANCE)
+def _format_hand_uncached():
+    hand = _started_game().player_objects[0].hand
+    
+    def format_hand():
+        HAND_TEXT.clear()
+        CardUI.format_hand(hand)
+    return format_hand, 1
+
+@benchmark("ui.bidding_view", MICRO_TOLERANCE)
+def _bidding_view():
+    return lambda: CardUI.create_bidding_view(SCOPE), 1
+
+@benchmark("ui.tarneeb_selection_view", MICRO_TOLERANCE)
+def _tarneeb_selection_view():
+    return lambda: CardUI.create_tarneeb_selection_view(SCOPE), 1
+
+@benchmark("ui.card_selection_view", MICRO_TOLERANCE)
+def _card_selection_view():
+    game = _mid_trick_game()
+    player = game.player_objects[game.engine.current_turn]
+    return lambda: CardUI.create_card_selection_view(SCOPE, player.hand, game.lead_suit, game.tarneeb_suit), 1
+
+@benchmark("ui.show_cards_view", MICRO_TOLERANCE)
+def _show_cards_view():
+    return lambda: CardUI.create_show_cards_button_view(SCOPE), 1
+
+@benchmark("embed.table", MICRO_TOLERANCE)
+def _table_embed():
+    game = _mid_trick_game()
+    return lambda: GameStateEmbed.create_table_embed(game), 1
+
+@benchmark("embed.game_state", MICRO_TOLERANCE)
+def _game_state_embed():
+    game = _mid_trick_game()
+    return lambda: GameStateEmbed.create_game_state_embed(game), 1
+
+@benchmark("embed.teams", MICRO_TOLERANCE)
+def _teams_embed():
+    game = _started_game()
+    return lambda: GameStateEmbed.create_teams_embed(game), 1
+
+@benchmark("embed.scores", MICRO_TOLERANCE)
+def _scores_embed():
+    game = _mid_trick_game()
+    return lambda: GameStateEmbed.create_scores_embed(game), 1
+
+@benchmark("embed.round_end", MICRO_TOLERANCE)
+def _round_end_embed():
+    game = _mid_trick_game()
+    return lambda: GameStateEmbed.create_round_end_embed(game, "Team 1 made their bid!", [7, 6]), 1
+
+# End to end
+class StubMessage:
+    async def edit(self, **kwargs):
+        return self
+
+class StubChannel:
+    """Channel that accepts every send instantly"""
+    
+    id = 0
+    
+    async def send(self, **kwargs):
+        return StubMessage()
+
+class StubBot:
+    def __init__(self):
+        self.message_scheduler = MessageScheduler(global_rate=1e9, channel_burst=10 ** 9, channel_period=1)
+
+async def play_stub_game(seed: int) -> int:
+    """Play an all-bot game through TarneebGame's loop with no pauses; returns rounds played"""
+    bot = StubBot()
+    bot.message_scheduler.start()
+    game = TarneebGame(0, "bench", "bench")
+    game.BOT_THINK_DELAY = game.TRICK_PAUSE = game.ROUND_END_PAUSE = game.ROUND_START_PAUSE = 0
+    game.TABLE_EDIT_DELAY = 0
+    game.seed = seed
+    game.engine.rng.seed(seed)
+    game.start_game()
+    game.start_loop(StubChannel(), bot)
+    await game.loop_task
+    bot.message_scheduler.stop()
+    return game.round_number
+
+@benchmark("e2e.bot_round")
+def _bot_round():
+    loop = asyncio.new_event_loop()
+    # The seed fixes deals and bot decisions, so every call plays the same rounds
+    rounds = loop.run_until_complete(play_stub_game(SEED))
+    return lambda: loop.run_until_complete(play_stub_game(SEED)), rounds
+
+def run_benchmarks(names: Optional[List[str]] = None, repeats: int = 21, min_time: float = 0.02) -> Dict:
+    """Run the named benchmarks (all by default) and return a JSON-ready report
+
+    Repeats are interleaved: each round times every benchmark once, so a slow spell
+    on the machine costs each benchmark one repeat rather than all of one's repeats.
+    """
+    selected = {}
+    for name, setup in BENCHMARKS.items():
+        if names and not any(name.startswith(prefix) for prefix in names):
+            continue
+        func, ops = setup()
+        selected[name] = (func, ops, calibrate(func, min_time))
+    
+    timings: Dict[str, List[float]] = {name: [] for name in selected}
+    for _ in range(repeats):
+        for name, (func, ops, number) in selected.items():
+            timings[name].append(time_calls(func, number))
+    results = {name: summarize(timings[name], number, ops) for name, (func, ops, number) in selected.items()}
+    
+    return {
+        'created_at': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+
+def compare(report: Dict, baseline: Dict, threshold: float = 0.25) -> List[Dict]:
+    """Changes in the fastest repeat against baseline; a benchmark regressed if it is slower
+    by more than threshold (or its own tolerance, if larger)
+
+    The fastest repeat is the one least disturbed by the rest of the machine, so it
+    moves far less from run to run than the median. Ratios are divided by the
+    machine's drift (see machine_drift), so a machine running slower overall isn't
+    read as a regression of every benchmark.
+    """
+    drift = machine_drift(report, baseline)
+    rows = []
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        allowed = max(threshold, TOLERANCES.get(name, 0.0))
+        ratio = result['min_ns'] / base['min_ns'] / drift if base['min_ns'] else 1.0
+        rows.append({
+            'name': name,
+            'baseline_ns': base['min_ns'],
+            'current_ns': result['min_ns'],
+            'ratio': ratio,
+            'allowed': allowed,
+            'regressed': ratio > 1 + allowed
+        })
+    return rows
+
+def machine_drift(report: Dict, baseline: Dict) -> float:
+    """Median slowdown of all benchmarks against baseline
+
+    A change slows down a few benchmarks; a busier or down-clocked machine slows
+    down all of them, which moves the median. Too few benchmarks to tell: 1.0.
+    """
+    ratios = [result['min_ns'] / baseline['results'][name]['min_ns']
+              for name, result in report['results'].items()
+              if baseline.get('results', {}).get(name, {}).get('min_ns')]
+    return statistics.median(ratios) if len(ratios) >= MIN_DRIFT_SAMPLES else 1.0
+
+def merge_fastest(report: Dict, rerun: Dict):
+    """Keep each benchmark's faster result from report and a rerun of some of its benchmarks"""
+    for name, result in rerun['results'].items():
+        current = report['results'].get(name)
+        if current is None or result['min_ns'] < current['min_ns']:
+            report['results'][name] = result
+
+def _format_ns(value: float) -> str:
+    if value >= 1e6:
+        return f"{value / 1e6:.2f}ms"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f}µs"
+    return f"{value:.0f}ns"
+
+def format_report(report: Dict) -> str:
+    """Human-readable benchmark results"""
+    lines = [f"⏱️ Python {report['python']} on {report['machine']}"]
+    for name, result in report['results'].items():
+        lines.append(f"   {name:<28} {_format_ns(result['median_ns']):>10} "
+                     f"(min {_format_ns(result['min_ns'])}, {result['calls']} calls)")
+    return "\n".join(lines)
+
+def format_comparison(rows: List[Dict], threshold: float, drift: float = 1.0) -> str:
+    """Human-readable comparison against a baseline"""
+    lines = [f"📊 Fastest repeat compared with baseline (regression threshold {threshold:.0%}, "
+             f"machine drift {drift - 1:+.1%} factored out)"]
+    for row in rows:
+        icon = "❌" if row['regressed'] else "✅"
+        allowed = f", allowed {row['allowed']:+.0%}" if row['allowed'] != threshold else ""
+        lines.append(f"{icon} {row['name']:<28} {_format_ns(row['baseline_ns']):>10} -> "
+                     f"{_format_ns(row['current_ns']):>10} ({row['ratio'] - 1:+.1%}{allowed})")
+    return "\n".join(lines)
@@ -1,9 +1,17 @@
 import discord
 from typing import List, Tuple, Optional
 
-# Card definitions
-SUITS = ["♠", "♣", "♥", "♦"]
-SUIT_NAMES = {"♠": "Spades", "♣": "Clubs", "♥": "Hearts", "♦": "Diamonds"}
+from ...render_cache import RenderCache
+from . import cards
+from .cards import SUITS, SUIT_NAMES
+
+# Component layouts are cached as tuples of Button keyword arguments, with custom_ids
+# holding only the action part. Every call still builds a fresh View, since a View is
+# bound to the message it is sent with, and prefixes the ids with the game's scope
+# ("game_id:round:nonce", see TarneebGame.interaction_scope).
+VIEW_TEMPLATES = RenderCache("view_templates")
+CARD_VIEW_TEMPLATES = RenderCache("card_selection_views", maxsize=4096)
+HAND_TEXT = RenderCache("hand_text", maxsize=4096)
 
 class CardUI:
     """Handle card display and UI elements"""
@@ -23,99 +31,95 @@ class CardUI:
         return f"{rank}{emoji}"
     
     @staticmethod
-    def format_hand(hand: List[Tuple[str, str]]) -> str:
-        """Format a hand of cards for display"""
-        if not hand:
+    def format_hand(hand: cards.Hand) -> str:
+        """Format a hand of cards for display (memoized on the hand's cards)"""
+        mask = cards.as_mask(hand)
+        return HAND_TEXT.get(mask, lambda: CardUI._format_mask(mask))
+    
+    @staticmethod
+    def _format_mask(mask: int) -> str:
+        if not mask:
             return "No cards"
         
-        # Sort by suit, then by rank
-        sorted_hand = sorted(hand, key=lambda x: (SUITS.index(x[1]), ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A'].index(x[0])))
-        return " ".join([CardUI.format_card(card) for card in sorted_hand])
+        # Card ids are already ordered by suit, then by rank
+        return " ".join([CardUI.format_card(card) for card in cards.mask_tuples(mask)])
     
     @staticmethod
-    def create_bidding_view() -> discord.ui.View:
-        """Create bidding interface with buttons"""
+    def _build_view(template: Tuple[dict, ...], scope: str) -> discord.ui.View:
+        """Create a fresh view from a cached tuple of Button keyword arguments"""
         view = discord.ui.View(timeout=300)
-        
+        for kwargs in template:
+            view.add_item(discord.ui.Button(**{**kwargs, 'custom_id': f"{scope}:{kwargs['custom_id']}"}))
+        return view
+    
+    @staticmethod
+    def create_bidding_view(scope: str) -> discord.ui.View:
+        """Create bidding interface with buttons"""
+        return CardUI._build_view(VIEW_TEMPLATES.get("bidding", CardUI._bidding_template), scope)
+    
+    @staticmethod
+    def _bidding_template() -> Tuple[dict, ...]:
         # Add bid buttons (1-7)
-        for bid in range(1, 8):
-            button = discord.ui.Button(
-                label=str(bid),
-                style=discord.ButtonStyle.primary,
-                custom_id=f"bid_{bid}"
-            )
-            view.add_item(button)
+        buttons = [dict(label=str(bid), style=discord.ButtonStyle.primary, custom_id=f"bid:{bid}") for bid in range(1, 8)]
         
         # Add pass button
-        pass_button = discord.ui.Button(
-            label="Pass",
-            style=discord.ButtonStyle.secondary,
-            custom_id="pass"
-        )
-        view.add_item(pass_button)
-        
-        return view
+        buttons.append(dict(label="Pass", style=discord.ButtonStyle.secondary, custom_id="pass"))
+        return tuple(buttons)
     
     @staticmethod
-    def create_tarneeb_selection_view() -> discord.ui.View:
+    def create_tarneeb_selection_view(scope: str) -> discord.ui.View:
         """Create tarneeb suit selection interface"""
-        view = discord.ui.View(timeout=300)
+        return CardUI._build_view(VIEW_TEMPLATES.get("tarneeb_selection", CardUI._tarneeb_selection_template), scope)
+    
+    @staticmethod
+    def _tarneeb_selection_template() -> Tuple[dict, ...]:
+        return tuple(
+            dict(label=SUIT_NAMES[suit], style=discord.ButtonStyle.primary, custom_id=f"tarneeb:{suit}",
+                 emoji=CardUI.SUIT_EMOJIS[suit])
+            for suit in SUITS
+        )
+    
+    @staticmethod
+    def create_card_selection_view(scope: str, hand: cards.Hand, lead_suit: Optional[str], tarneeb_suit: str) -> discord.ui.View:
+        """Create card selection interface
         
-        for suit in SUITS:
-            button = discord.ui.Button(
-                label=SUIT_NAMES[suit],
-                style=discord.ButtonStyle.primary,
-                custom_id=f"tarneeb_{suit}",
-                emoji=CardUI.SUIT_EMOJIS[suit]
-            )
-            view.add_item(button)
+        The layout is cached on the playable cards and trump, which is all that the
+        hand and lead suit contribute to it.
+        """
+        # Filter valid cards (must follow suit if possible)
+        valid_cards = cards.legal_mask(cards.as_mask(hand), cards.SUIT_INDEX[lead_suit] if lead_suit else None)
         
-        return view
+        template = CARD_VIEW_TEMPLATES.get(
+            (valid_cards, tarneeb_suit), lambda: CardUI._card_selection_template(valid_cards, tarneeb_suit)
+        )
+        return CardUI._build_view(template, scope)
     
     @staticmethod
-    def create_card_selection_view(hand: List[Tuple[str, str]], lead_suit: Optional[str], tarneeb_suit: str) -> discord.ui.View:
-        """Create card selection interface"""
-        view = discord.ui.View(timeout=300)
-        
-        # Filter valid cards
-        valid_cards = []
-        if lead_suit:
-            # Must follow suit if possible
-            same_suit = [card for card in hand if card[1] == lead_suit]
-            valid_cards = same_suit if same_suit else hand
-        else:
-            valid_cards = hand
+    def _card_selection_template(valid_cards: int, tarneeb_suit: str) -> Tuple[dict, ...]:
+        buttons = []
         
         # Limit to 25 buttons (Discord's max per view)
-        display_cards = valid_cards[:25]
-        
-        for card in display_cards:
-            rank, suit = card
+        for card in cards.mask_cards(valid_cards)[:25]:
+            rank, suit = cards.card_tuple(card)
             # Use simple suit emojis for buttons
             suit_emoji = CardUI.SUIT_EMOJIS.get(suit, suit)
             
             # Highlight tarneeb cards
             style = discord.ButtonStyle.danger if suit == tarneeb_suit else discord.ButtonStyle.primary
             
-            button = discord.ui.Button(
-                label=f"{rank}{suit}",
-                style=style,
-                custom_id=f"card_{rank}_{suit}",
-                emoji=suit_emoji
-            )
-            view.add_item(button)
+            buttons.append(dict(label=f"{rank}{suit}", style=style, custom_id=f"card:{card}", emoji=suit_emoji))
         
-        return view
+        return tuple(buttons)
     
     @staticmethod
-    def create_show_cards_button_view(current_player_id) -> discord.ui.View:
+    def create_show_cards_button_view(scope: str) -> discord.ui.View:
         """Create a button for current player to see their cards privately"""
         view = discord.ui.View(timeout=300)
         
         button = discord.ui.Button(
             label="Show My Cards",
             style=discord.ButtonStyle.primary,
-            custom_id=f"show_my_cards_{current_player_id}",
+            custom_id=f"{scope}:cards",
             emoji="🃏"
         )
         view.add_item(button)
@@ -0,0 +1,141 @@
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+# Card definitions
+SUITS = ["♠", "♣", "♥", "♦"]
+SUIT_NAMES = {"♠": "Spades", "♣": "Clubs", "♥": "Hearts", "♦": "Diamonds"}
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+
+# A card is an int in 0..51 (suit * 13 + rank index), so ordering cards by id
+# orders them by suit and then by rank. A hand is a 52-bit mask of card ids.
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+SUIT_MASKS = [0x1FFF << (13 * i) for i in range(4)]
+FULL_DECK = (1 << 52) - 1
+
+CARD_TUPLES: List[Tuple[str, str]] = [(rank, suit) for suit in SUITS for rank in RANKS]
+CARD_IDS = {card: i for i, card in enumerate(CARD_TUPLES)}
+
+# High-card points for the J, Q, K, A bits of a single suit (indexed by a 4-bit mask)
+HONOR_POINTS = [
+    (i & 1) * 1 + ((i >> 1) & 1) * 2 + ((i >> 2) & 1) * 3 + ((i >> 3) & 1) * 4
+    for i in range(16)
+]
+
+Hand = Union[int, Iterable[Tuple[str, str]]]
+
+if hasattr(int, "bit_count"):
+    def popcount(mask: int) -> int:
+        """Number of cards in a mask"""
+        return mask.bit_count()
+else:  # Python < 3.10
+    def popcount(mask: int) -> int:
+        """Number of cards in a mask"""
+        return bin(mask).count("1")
+
+def card_id(card: Tuple[str, str]) -> int:
+    """Convert a (rank, suit) tuple to a card id"""
+    return CARD_IDS[card]
+
+def card_tuple(card: int) -> Tuple[str, str]:
+    """Convert a card id to a (rank, suit) tuple"""
+    return CARD_TUPLES[card]
+
+def card_suit(card: int) -> int:
+    """Suit index of a card id"""
+    return card // 13
+
+def card_rank(card: int) -> int:
+    """Rank index of a card id (0 = '2', 12 = 'A')"""
+    return card % 13
+
+def hand_mask(hand: Iterable[Tuple[str, str]]) -> int:
+    """Build a mask from (rank, suit) tuples"""
+    mask = 0
+    for card in hand:
+        mask |= 1 << CARD_IDS[card]
+    return mask
+
+def as_mask(hand: Hand) -> int:
+    """Accept either a mask or an iterable of (rank, suit) tuples"""
+    if isinstance(hand, int):
+        return hand
+    return hand_mask(hand)
+
+def mask_cards(mask: int) -> List[int]:
+    """Card ids in a mask, in suit then rank order"""
+    cards = []
+    while mask:
+        low = mask & -mask
+        cards.append(low.bit_length() - 1)
+        mask ^= low
+    return cards
+
+def mask_tuples(mask: int) -> List[Tuple[str, str]]:
+    """(rank, suit) tuples in a mask, in suit then rank order"""
+    return [CARD_TUPLES[card] for card in mask_cards(mask)]
+
+def highest(mask: int) -> int:
+    """Highest card id in a mask (only meaningful within one suit)"""
+    return mask.bit_length() - 1
+
+def lowest(mask: int) -> int:
+    """Lowest card id in a mask (only meaningful within one suit)"""
+    return (mask & -mask).bit_length() - 1
+
+def lowest_rank(mask: int) -> int:
+    """Lowest-ranked card across all suits, first suit wins ties"""
+    best = -1
+    for suit_mask in SUIT_MASKS:
+        cards = mask & suit_mask
+        if cards:
+            card = lowest(cards)
+            if best < 0 or card % 13 < best % 13:
+                best = card
+    return best
+
+def has_suit(mask: int, suit: int) -> bool:
+    """Check if a mask holds any card of a suit index"""
+    return bool(mask & SUIT_MASKS[suit])
+
+def legal_mask(hand: int, lead_suit: Optional[int]) -> int:
+    """Cards that may be played: the lead suit if held, otherwise anything"""
+    if lead_suit is None:
+        return hand
+    follow = hand & SUIT_MASKS[lead_suit]
+    return follow if follow else hand
+
+def higher_in_suit(mask: int, card: int) -> int:
+    """Cards in mask of the same suit as card that outrank it"""
+    return mask & SUIT_MASKS[card // 13] & ~((2 << card) - 1)
+
+def winning_card(trick_mask: int, lead_suit: int, trump_suit: Optional[int]) -> int:
+    """Card currently winning a trick given as a mask, or -1 for an empty trick"""
+    if trump_suit is not None:
+        trumps = trick_mask & SUIT_MASKS[trump_suit]
+        if trumps:
+            return trumps.bit_length() - 1
+    return (trick_mask & SUIT_MASKS[lead_suit]).bit_length() - 1
+
+def trick_winner(trick: Sequence[int], trump_suit: Optional[int]) -> int:
+    """Position in play order of the card that wins a trick"""
+    mask = 0
+    for card in trick:
+        mask |= 1 << card
+    return trick.index(winning_card(mask, trick[0] // 13, trump_suit))
+
+def beats(card: int, other: int, trump_suit: Optional[int]) -> bool:
+    """Check if card beats the card currently winning the trick"""
+    if other < 0:
+        return True
+    suit, other_suit = card // 13, other // 13
+    if suit == other_suit:
+        return card > other
+    return suit == trump_suit
+
+def honor_points(mask: int) -> List[int]:
+    """High-card points (A=4, K=3, Q=2, J=1) per suit"""
+    return [HONOR_POINTS[(mask >> (13 * s + 9)) & 0xF] for s in range(4)]
+
+def suit_lengths(mask: int) -> List[int]:
+    """Number of cards held in each suit"""
+    return [popcount(mask & suit_mask) for suit_mask in SUIT_MASKS]
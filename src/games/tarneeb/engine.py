@@ -0,0 +1,341 @@
+import copy
+import random
+import struct
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import cards
+
+# Outcomes returned by the engine's actions
+BIDDING = "bidding"
+BIDDING_COMPLETE = "bidding_complete"
+REDEAL = "redeal"
+NEXT_TURN = "next_turn"
+TRICK_COMPLETE = "trick_complete"
+ROUND_COMPLETE = "round_complete"
+GAME_OVER = "game_over"
+
+TARGET_SCORE = 31
+MAX_BID = 7
+
+# Event kinds passed to TarneebEngine.recorder as (kind, seat, value); seat is -1 when
+# not tied to a seat. Actions are what a replay feeds back in; the rest it checks.
+EVENT_START = 0        # Written by the game: value is the deal seed
+EVENT_DEAL = 1         # value: round number
+EVENT_BID = 2          # value: bid
+EVENT_PASS = 3
+EVENT_TRUMP = 4        # value: suit index
+EVENT_CARD = 5         # value: card id
+EVENT_TRICK = 6        # seat: winner, value: tricks played this round
+EVENT_SCORE = 7        # seat: scoring team, value: points
+EVENT_NEXT_ROUND = 8
+ACTION_EVENTS = (EVENT_BID, EVENT_PASS, EVENT_TRUMP, EVENT_CARD, EVENT_NEXT_ROUND)
+
+STATES = ("waiting", "bidding", "tarneeb_selection", "playing", "round_over", "finished")
+
+# Snapshot layout: version, state, round, scores, bidding and turn fields (-1 for None),
+# hands and played cards as masks, voids, tricks won, deals made, then three (seat, value) lists
+SNAPSHOT_VERSION = 2
+_SNAPSHOT_HEADER = struct.Struct("<BBH2HBbBBBbbb5Q4B4BH")
+
+class TarneebEngine:
+    """Pure Tarneeb rules and state machine - no Discord, no I/O, no sleeps
+
+    Seats are 0-3 (teams are seats 0 & 2 and 1 & 3), suits are indexes into
+    cards.SUITS and cards are card ids from cards.py.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+        self.recorder: Optional[Callable[[int, int, int], None]] = None  # Receives every event
+        self.deals = 0  # Shuffles drawn from rng so far
+        self.state = "waiting"  # waiting, bidding, tarneeb_selection, playing, round_over, finished
+        self.round_number = 1
+        self.teams_scores = [0, 0]
+        self.round_history: List[Dict] = []  # last_round of every scored round
+        self.deck: List[int] = []
+        self.hands = [0, 0, 0, 0]
+        self._reset_round()
+
+    def _reset_round(self):
+        """Reset round-specific state"""
+        self.current_bid = 0
+        self.highest_bidder: Optional[int] = None
+        self.bidding_turn = 0
+        self.passes_count = 0
+        self.bids: List[Tuple[int, int]] = []  # (seat, value) in bidding order, 0 for a pass
+        self.current_turn = 0
+        self.trump: Optional[int] = None
+        self.trick: List[Tuple[int, int]] = []  # (seat, card) in play order
+        self.lead_suit: Optional[int] = None
+        self.tricks_won = [0, 0, 0, 0]
+        self.played_mask = 0  # Every card played this round
+        self.voids = [0, 0, 0, 0]  # Per seat, bit s set once the seat failed to follow suit s
+        self.last_trick: List[Tuple[int, int]] = []
+        self.last_trick_winner: Optional[int] = None
+        self.last_round: Optional[Dict] = None
+
+    def start_game(self):
+        """Reset scores and deal the first round"""
+        self.round_number = 1
+        self.teams_scores = [0, 0]
+        self.round_history = []
+        self.start_round()
+
+    def start_round(self):
+        """Reset the round and deal fresh hands (round number is unchanged)"""
+        self._reset_round()
+        self.state = "bidding"
+        self.deal()
+
+    def next_round(self):
+        """Advance to the next round after a round has been scored"""
+        self.round_number += 1
+        self._record(EVENT_NEXT_ROUND, -1)
+        self.start_round()
+
+    def deal(self):
+        """Shuffle the deck and deal 13 cards to each seat"""
+        self.deck = list(range(52))
+        self.rng.shuffle(self.deck)
+        self.deals += 1
+
+        hands = [0, 0, 0, 0]
+        for i, card in enumerate(self.deck):
+            hands[i % 4] |= 1 << card
+        self.hands = hands
+        self._record(EVENT_DEAL, -1, self.round_number)
+
+    def _record(self, kind: int, seat: int, value: int = 0):
+        if self.recorder is not None:
+            self.recorder(kind, seat, value)
+
+    # Bidding
+    def bid(self, seat: int, value: int) -> str:
+        """Place a bid for seat; returns the bidding outcome"""
+        if self.state != "bidding" or seat != self.bidding_turn:
+            raise ValueError(f"Seat {seat} cannot bid now")
+        if value <= self.current_bid or value > MAX_BID:
+            raise ValueError(f"Bid must be between {self.current_bid + 1} and {MAX_BID}")
+
+        self.current_bid = value
+        self.highest_bidder = seat
+        self.passes_count = 0
+        self.bids.append((seat, value))
+        self._record(EVENT_BID, seat, value)
+        return self._next_bidding_turn()
+
+    def pass_bid(self, seat: int) -> str:
+        """Pass for seat; returns the bidding outcome"""
+        if self.state != "bidding" or seat != self.bidding_turn:
+            raise ValueError(f"Seat {seat} cannot pass now")
+
+        self.passes_count += 1
+        self.bids.append((seat, 0))
+        self._record(EVENT_PASS, seat)
+        return self._next_bidding_turn()
+
+    def _next_bidding_turn(self) -> str:
+        """Move to next bidding turn"""
+        self.bidding_turn = (self.bidding_turn + 1) % 4
+
+        if self.passes_count >= 3 and self.highest_bidder is not None:
+            self.state = "tarneeb_selection"
+            return BIDDING_COMPLETE
+        if self.passes_count >= 4:
+            # All players passed, redeal the same round
+            self.start_round()
+            return REDEAL
+        return BIDDING
+
+    def choose_trump(self, seat: int, suit: int):
+        """Set the tarneeb suit and start the playing phase"""
+        if self.state != "tarneeb_selection" or seat != self.highest_bidder:
+            raise ValueError(f"Seat {seat} cannot choose the tarneeb suit")
+
+        self.trump = suit
+        self._record(EVENT_TRUMP, seat, suit)
+        self.state = "playing"
+        self.current_turn = 0
+
+    # Playing
+    def legal_cards(self, seat: int) -> int:
+        """Mask of cards seat may play right now"""
+        return cards.legal_mask(self.hands[seat], self.lead_suit)
+
+    def is_legal(self, seat: int, card: int) -> bool:
+        """Check if seat may play card right now"""
+        return (self.state == "playing" and seat == self.current_turn
+                and bool(self.legal_cards(seat) & (1 << card)))
+
+    def play(self, seat: int, card: int) -> str:
+        """Play a card for seat; returns what the play completed"""
+        if not self.is_legal(seat, card):
+            raise ValueError(f"Seat {seat} cannot play card {card}")
+
+        self.hands[seat] ^= 1 << card
+        self.played_mask |= 1 << card
+        self.trick.append((seat, card))
+        if self.lead_suit is None:
+            self.lead_suit = card // 13
+        elif card // 13 != self.lead_suit:
+            self.voids[seat] |= 1 << self.lead_suit
+        self._record(EVENT_CARD, seat, card)
+
+        if len(self.trick) < 4:
+            self.current_turn = (seat + 1) % 4
+            return NEXT_TURN
+        return self._end_trick()
+
+    def _end_trick(self) -> str:
+        """Award the completed trick and score the round if it was the last"""
+        winner_index = cards.trick_winner([card for _, card in self.trick], self.trump)
+        winner = self.trick[winner_index][0]
+        self.tricks_won[winner] += 1
+
+        self.last_trick = self.trick
+        self.last_trick_winner = winner
+        self.trick = []
+        self.lead_suit = None
+        self.current_turn = winner
+        self._record(EVENT_TRICK, winner, sum(self.tricks_won))
+
+        if sum(self.tricks_won) < 13:
+            return TRICK_COMPLETE
+        return self._end_round()
+
+    def _end_round(self) -> str:
+        """Score the round once all 13 tricks are played"""
+        team_tricks = [self.tricks_won[0] + self.tricks_won[2], self.tricks_won[1] + self.tricks_won[3]]
+        bidding_team = self.highest_bidder % 2
+        bid_made = team_tricks[bidding_team] >= self.current_bid
+        scoring_team = bidding_team if bid_made else 1 - bidding_team
+        self.teams_scores[scoring_team] += self.current_bid
+
+        self.last_round = {
+            'bidder': self.highest_bidder,
+            'bidding_team': bidding_team,
+            'bid': self.current_bid,
+            'bid_made': bid_made,
+            'scoring_team': scoring_team,
+            'points': self.current_bid,
+            'team_tricks': team_tricks
+        }
+        self.round_history.append(self.last_round)
+        self._record(EVENT_SCORE, scoring_team, self.current_bid)
+
+        if max(self.teams_scores) >= TARGET_SCORE:
+            self.state = "finished"
+            return GAME_OVER
+        self.state = "round_over"
+        return ROUND_COMPLETE
+
+    @property
+    def winning_team(self) -> Optional[int]:
+        """Team index that reached the target score, if any"""
+        for team, score in enumerate(self.teams_scores):
+            if score >= TARGET_SCORE:
+                return team
+        return None
+
+    def trick_cards(self) -> List[int]:
+        """Cards in the current trick in play order"""
+        return [card for _, card in self.trick]
+
+    def to_bytes(self) -> bytes:
+        """Compact binary snapshot of the game (round history is not included)"""
+        def optional(value):
+            return -1 if value is None else value
+
+        def pairs(items):
+            return bytes([len(items)]) + bytes(b for pair in items for b in pair)
+
+        header = _SNAPSHOT_HEADER.pack(
+            SNAPSHOT_VERSION, STATES.index(self.state), self.round_number, *self.teams_scores,
+            self.current_bid, optional(self.highest_bidder), self.bidding_turn, self.passes_count,
+            self.current_turn, optional(self.trump), optional(self.lead_suit), optional(self.last_trick_winner),
+            *self.hands, self.played_mask, *self.voids, *self.tricks_won, self.deals
+        )
+        return header + pairs(self.bids) + pairs(self.trick) + pairs(self.last_trick)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, rng: Optional[random.Random] = None) -> "TarneebEngine":
+        """Rebuild an engine from to_bytes output
+
+        rng is advanced past the deals already made, so an rng seeded like the
+        original one continues the same sequence of deals.
+        """
+        fields = _SNAPSHOT_HEADER.unpack_from(data)
+        if fields[0] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {fields[0]}")
+
+        def optional(value):
+            return None if value == -1 else value
+
+        engine = cls(rng)
+        engine.state = STATES[fields[1]]
+        engine.round_number = fields[2]
+        engine.teams_scores = list(fields[3:5])
+        (engine.current_bid, highest_bidder, engine.bidding_turn, engine.passes_count,
+         engine.current_turn, trump, lead_suit, last_trick_winner) = fields[5:13]
+        engine.highest_bidder = optional(highest_bidder)
+        engine.trump = optional(trump)
+        engine.lead_suit = optional(lead_suit)
+        engine.last_trick_winner = optional(last_trick_winner)
+        engine.hands = list(fields[13:17])
+        engine.played_mask = fields[17]
+        engine.voids = list(fields[18:22])
+        engine.tricks_won = list(fields[22:26])
+        engine.deals = fields[26]
+        for _ in range(engine.deals):
+            engine.rng.shuffle(list(range(52)))
+
+        offset = _SNAPSHOT_HEADER.size
+        lists = []
+        for _ in range(3):
+            count = data[offset]
+            values = data[offset + 1:offset + 1 + 2 * count]
+            lists.append([(values[i], values[i + 1]) for i in range(0, len(values), 2)])
+            offset += 1 + 2 * count
+        engine.bids, engine.trick, engine.last_trick = lists
+        return engine
+
+    def copy(self) -> "TarneebEngine":
+        """Independent snapshot of the game that shares only the RNG (events are not recorded)"""
+        clone = copy.copy(self)
+        clone.recorder = None
+        clone.teams_scores = list(self.teams_scores)
+        clone.round_history = list(self.round_history)
+        clone.hands = list(self.hands)
+        clone.bids = list(self.bids)
+        clone.trick = list(self.trick)
+        clone.tricks_won = list(self.tricks_won)
+        clone.voids = list(self.voids)
+        return clone
+
+def play_game(ai_players: Sequence, rng: Optional[random.Random] = None,
+              engine: Optional[TarneebEngine] = None) -> TarneebEngine:
+    """Play a complete game to 31 points with an AI in every seat"""
+    engine = engine or TarneebEngine(rng)
+    engine.start_game()
+
+    while True:
+        if engine.state == "bidding":
+            seat = engine.bidding_turn
+            value = ai_players[seat].make_bid_decision(
+                engine.hands[seat], engine.current_bid, engine.passes_count, seat
+            )
+            if value > 0:
+                engine.bid(seat, value)
+            else:
+                engine.pass_bid(seat)
+        elif engine.state == "tarneeb_selection":
+            seat = engine.highest_bidder
+            suit = ai_players[seat].choose_tarneeb_suit(engine.hands[seat])
+            engine.choose_trump(seat, cards.SUIT_INDEX[suit])
+        elif engine.state == "playing":
+            seat = engine.current_turn
+            engine.play(seat, ai_players[seat].choose_card_for_seat(engine, seat))
+        elif engine.state == "round_over":
+            engine.next_round()
+        else:
+            return engine
@@ -1,6 +1,8 @@
 import discord
 from typing import List
 
+from . import cards
+
 class GameStateEmbed:
     """Create embeds for game state display"""
     
@@ -84,35 +86,76 @@ class GameStateEmbed:
         return embed
     
     @staticmethod
-    def create_playing_embed(game, current_player) -> discord.Embed:
-        """Create embed for playing phase"""
-        embed = discord.Embed(
-            title="🃏 Playing Phase",
-            description=f"**{current_player.name}**'s turn to play",
-            color=0x0099ff
-        )
-        
+    def create_table_embed(game) -> discord.Embed:
+        """Create the live table embed: bids, contract, current trick, tricks and scores"""
         suit_names = {'♠': 'Spades', '♥': 'Hearts', '♦': 'Diamonds', '♣': 'Clubs'}
+        engine = game.engine
+        
+        if game.state == "bidding":
+            phase, color = "Bidding", 0xffd700
+            status = f"**{game.player_objects[game.bidding_turn].name}**'s turn to bid"
+        elif game.state == "tarneeb_selection":
+            phase, color = "Bidding", 0xff6600
+            status = f"**{game.highest_bidder.name}** won with {game.current_bid} tricks and is choosing the tarneeb suit"
+        elif game.state == "playing":
+            phase, color = "Playing", 0x0099ff
+            status = f"**{game.player_objects[game.current_turn_index].name}**'s turn to play"
+        else:
+            phase, color = "Playing", 0x00ff00
+            status = "Round complete"
         
-        if game.lead_suit:
-            embed.add_field(name="Lead Suit", value=f"{game.lead_suit} {suit_names[game.lead_suit]}", inline=True)
-        
-        embed.add_field(name="Tarneeb Suit", value=f"{game.tarneeb_suit} {suit_names[game.tarneeb_suit]}", inline=True)
+        embed = discord.Embed(
+            title=f"🃏 Round {game.round_number} - {phase}",
+            description=status,
+            color=color
+        )
         
-        # Show cards played in current trick
-        if game.played_cards:
-            cards_played = []
-            for player, card in game.played_cards:
-                card_str = f"{card[0]}{card[1]}"
-                cards_played.append(f"**{player.name}**: {card_str}")
+        if game.tarneeb_suit:
+            # Contract is settled; the bidding log is no longer needed
+            team = "Team 1" if engine.highest_bidder % 2 == 0 else "Team 2"
+            embed.add_field(name="Bid", value=f"{game.current_bid} tricks by {game.highest_bidder.name} ({team})", inline=True)
+            embed.add_field(name="Tarneeb Suit", value=f"{game.tarneeb_suit} {suit_names[game.tarneeb_suit]}", inline=True)
+        else:
+            bids = []
+            for seat, value in engine.bids:
+                player = game.player_objects[seat]
+                bids.append(f"{player.name}: {f'{value} tricks' if value else 'Pass'}")
+            embed.add_field(name="Bids", value="\n".join(bids) if bids else "No bids yet", inline=False)
+        
+        if game.state in ["playing", "round_over", "finished"]:
+            # Show cards played in the current trick, or the result of the last one
+            if game.played_cards:
+                cards_played = []
+                for player, card in game.played_cards:
+                    cards_played.append(f"**{player.name}**: {card[0]}{card[1]}")
+                
+                lead = f" ({game.lead_suit} {suit_names[game.lead_suit]} led)"
+                embed.add_field(name=f"Current Trick{lead}", value="\n".join(cards_played), inline=False)
+            elif engine.last_trick:
+                winner = engine.last_trick_winner
+                cards_played = []
+                for seat, card in engine.last_trick:
+                    rank, suit = cards.card_tuple(card)
+                    line = f"{game.player_objects[seat].name}: {rank}{suit}"
+                    cards_played.append(f"**🏆 {line}**" if seat == winner else line)
+                
+                embed.add_field(name=f"Last Trick - {game.player_objects[winner].name} wins", value="\n".join(cards_played), inline=False)
             
-            embed.add_field(name="Cards Played", value="\n".join(cards_played), inline=False)
+            tricks = engine.tricks_won
+            embed.add_field(name="Tricks", value=f"Team 1: {tricks[0] + tricks[2]}\nTeam 2: {tricks[1] + tricks[3]}", inline=True)
+        
+        embed.add_field(name="Scores", value=f"Team 1: {game.teams_scores[0]}\nTeam 2: {game.teams_scores[1]}", inline=True)
         
-        if not current_player.is_bot:
+        if game.state == "playing" and not game.player_objects[game.current_turn_index].is_bot:
             embed.add_field(name="Instructions", value="Click 'Show My Cards' button to see your options", inline=False)
         
         return embed
     
+    @staticmethod
+    def create_playing_embed(game, current_player) -> discord.Embed:
+        """Create embed for playing phase (the live table)"""
+        return GameStateEmbed.create_table_embed(game)
+    
     @staticmethod
     def create_round_end_embed(game, result_msg: str, team_tricks: List[int]) -> discord.Embed:
         """Create embed for round end results"""
@@ -0,0 +1,85 @@
+from typing import TYPE_CHECKING, Dict, Sequence
+
+from . import cards
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy is only imported by the batch functions, so bots and AI workers that score
+# one hand at a time don't pay for loading it
+
+# High-card points by rank index (J=1, Q=2, K=3, A=4)
+HONOR_WEIGHTS = [0] * 9 + [1, 2, 3, 4]
+MAX_STRENGTH = 13
+
+def length_points(count: int) -> int:
+    """Strength bonus for a suit of count cards (potential trump suits)"""
+    if count >= 5:
+        return count - 2
+    if count >= 3:
+        return 1
+    return 0
+
+def hand_strength(mask: int) -> int:
+    """Bidding strength of one hand on a 0-13 scale"""
+    strength = sum(cards.honor_points(mask))
+    strength += sum(length_points(count) for count in cards.suit_lengths(mask))
+    return min(strength, MAX_STRENGTH)
+
+def best_trump(mask: int) -> int:
+    """Suit index with the best length and honors for trump (first suit wins ties)"""
+    lengths = cards.suit_lengths(mask)
+    honors = cards.honor_points(mask)
+    return max(range(4), key=lambda s: lengths[s] * 2 + honors[s])
+
+def opening_bid_range(strength: int) -> tuple:
+    """(min, max) opening bid for a strength with no earlier bids, (0, 0) to pass"""
+    if strength >= 8:
+        return (5, min(7, strength // 2 + 3))
+    if strength >= 5:
+        return (3, min(5, strength // 2 + 2))
+    return (0, 0)
+
+def masks_to_array(masks: Sequence[int]) -> "np.ndarray":
+    """Convert hand masks to an (N, 52) bool array indexed by card id"""
+    import numpy as np
+    values = np.asarray(masks, dtype=np.uint64)
+    return ((values[:, None] >> np.arange(52, dtype=np.uint64)) & np.uint64(1)).astype(bool)
+
+def evaluate_hands(hands: "np.ndarray") -> Dict[str, "np.ndarray"]:
+    """Score many hands at once from an (N, 52) or (N, 4, 13) 0/1 array
+
+    Returns per-hand arrays: honor_points (N, 4), suit_lengths (N, 4), strength (N,),
+    trump_suit (N,) as suit indexes, and the opening bid range bid_min/bid_max (N,)
+    where 0 means pass. Values match hand_strength, best_trump and opening_bid_range.
+    """
+    import numpy as np
+    hands = np.asarray(hands)
+    if hands.ndim == 2:
+        hands = hands.reshape(-1, 4, 13)
+    if hands.shape[1:] != (4, 13):
+        raise ValueError(f"Expected shape (N, 52) or (N, 4, 13), got {hands.shape}")
+    hands = hands.astype(np.int16, copy=False)
+
+    suit_lengths = hands.sum(axis=2)
+    honor_points = hands @ np.array(HONOR_WEIGHTS, dtype=np.int16)
+
+    bonus = np.where(suit_lengths >= 5, suit_lengths - 2, np.where(suit_lengths >= 3, 1, 0))
+    strength = np.minimum(honor_points.sum(axis=1) + bonus.sum(axis=1), MAX_STRENGTH)
+
+    trump_suit = np.argmax(suit_lengths * 2 + honor_points, axis=1)
+
+    strong = strength >= 8
+    medium = (strength >= 5) & ~strong
+    bid_min = np.where(strong, 5, np.where(medium, 3, 0))
+    bid_max = np.where(strong, np.minimum(7, strength // 2 + 3),
+                       np.where(medium, np.minimum(5, strength // 2 + 2), 0))
+
+    return {
+        'honor_points': honor_points,
+        'suit_lengths': suit_lengths,
+        'strength': strength,
+        'trump_suit': trump_suit,
+        'bid_min': bid_min,
+        'bid_max': bid_max
+    }
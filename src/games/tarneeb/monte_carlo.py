@@ -0,0 +1,115 @@
+import random
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from . import cards
+from .solver import DoubleDummySolver
+
+# A card-play policy: (hand mask, lead suit, trump suit, trick cards) -> card id
+Policy = Callable[[int, Optional[int], int, List[int]], int]
+
+MAX_SAMPLE_ATTEMPTS = 20
+ENDGAME_TRICKS = 4  # At or below this many tricks left, samples are solved exactly instead of played out (keep it small: see solver)
+
+def sample_hands(seat: int, hands: Sequence[int], played_mask: int, voids: Sequence[int],
+                 rng: random.Random) -> List[int]:
+    """Deal the cards seat cannot see to the other seats, consistent with play so far
+
+    Each other seat keeps its current card count and gets no card of a suit it has
+    already shown out of. Falls back to ignoring voids if no consistent deal is found.
+    """
+    unseen = cards.mask_cards(cards.FULL_DECK & ~played_mask & ~hands[seat])
+    others = [s for s in range(4) if s != seat]
+
+    for attempt in range(MAX_SAMPLE_ATTEMPTS + 1):
+        use_voids = attempt < MAX_SAMPLE_ATTEMPTS
+        rng.shuffle(unseen)
+        if use_voids:
+            # Place the most constrained suits first so they rarely run out of room
+            unseen.sort(key=lambda c: sum(not voids[s] >> (c // 13) & 1 for s in others))
+
+        capacity = {s: cards.popcount(hands[s]) for s in others}
+        sampled = list(hands)
+        for s in others:
+            sampled[s] = 0
+
+        for card in unseen:
+            eligible = [s for s in others if capacity[s] and not (use_voids and voids[s] >> (card // 13) & 1)]
+            if not eligible:
+                break
+            # Weight by remaining room so every consistent deal is roughly equally likely
+            target = rng.choices(eligible, weights=[capacity[s] for s in eligible])[0]
+            sampled[target] |= 1 << card
+            capacity[target] -= 1
+        else:
+            return sampled
+
+    return sampled
+
+def playout(hands: List[int], trick: List[Tuple[int, int]], turn: int, lead_suit: Optional[int],
+            trump: int, policy: Policy) -> List[int]:
+    """Play the rest of the round with every seat using policy; returns tricks won per team"""
+    hands = list(hands)
+    trick = list(trick)
+    team_tricks = [0, 0]
+
+    while True:
+        while len(trick) < 4:
+            card = policy(hands[turn], lead_suit, trump, [c for _, c in trick])
+            hands[turn] ^= 1 << card
+            if lead_suit is None:
+                lead_suit = card // 13
+            trick.append((turn, card))
+            turn = (turn + 1) % 4
+
+        winner = trick[cards.trick_winner([c for _, c in trick], trump)][0]
+        team_tricks[winner % 2] += 1
+        if not hands[winner]:
+            return team_tricks
+        trick = []
+        lead_suit = None
+        turn = winner
+
+def choose_card(engine, seat: int, policy: Policy, time_budget: float = 0.05,
+                rng: Optional[random.Random] = None, max_samples: Optional[int] = None) -> int:
+    """Pick the legal card with the most expected team tricks over sampled deals
+
+    engine is a TarneebEngine (or a copy of one) with seat to play. Each sample is
+    evaluated with policy playouts, or with the double-dummy solver in the endgame.
+    Sampling stops once time_budget seconds have passed (at least one sample is
+    always evaluated).
+    """
+    rng = rng or random
+    legal = cards.mask_cards(engine.legal_cards(seat))
+    if len(legal) == 1:
+        return legal[0]
+
+    deadline = time.perf_counter() + time_budget
+    team = seat % 2
+    next_turn = (seat + 1) % 4
+    totals = [0] * len(legal)
+    samples = 0
+    solver = None
+    if cards.popcount(engine.hands[seat]) <= ENDGAME_TRICKS:
+        solver = DoubleDummySolver(engine.trump)
+
+    while True:
+        hands = sample_hands(seat, engine.hands, engine.played_mask, engine.voids, rng)
+        if solver:
+            values = dict(solver.card_values(hands, engine.trick, seat))
+            for i, card in enumerate(legal):
+                totals[i] += values[card]
+        else:
+            for i, card in enumerate(legal):
+                hands[seat] ^= 1 << card
+                lead_suit = engine.lead_suit if engine.trick else card // 13
+                totals[i] += playout(hands, engine.trick + [(seat, card)], next_turn, lead_suit,
+                                     engine.trump, policy)[team]
+                hands[seat] ^= 1 << card
+
+        samples += 1
+        if time.perf_counter() >= deadline or (max_samples and samples >= max_samples):
+            break
+
+    best = max(range(len(legal)), key=lambda i: totals[i])
+    return legal[best]
@@ -0,0 +1,92 @@
+import random
+from typing import Iterable, List, Optional, Tuple
+
+from . import cards
+from . import engine as tarneeb_engine
+from .engine import TarneebEngine
+
+Event = Tuple[int, int, int]
+
+EVENT_NAMES = {
+    tarneeb_engine.EVENT_START: "start",
+    tarneeb_engine.EVENT_DEAL: "deal",
+    tarneeb_engine.EVENT_BID: "bid",
+    tarneeb_engine.EVENT_PASS: "pass",
+    tarneeb_engine.EVENT_TRUMP: "trump",
+    tarneeb_engine.EVENT_CARD: "card",
+    tarneeb_engine.EVENT_TRICK: "trick",
+    tarneeb_engine.EVENT_SCORE: "score",
+    tarneeb_engine.EVENT_NEXT_ROUND: "next_round"
+}
+
+class ReplayError(Exception):
+    """A logged game does not replay to the same events"""
+
+def describe(event: Event) -> str:
+    """Human-readable form of one event"""
+    kind, seat, value = event
+    name = EVENT_NAMES.get(kind, f"kind{kind}")
+    if kind == tarneeb_engine.EVENT_START:
+        return f"{name} seed={value}"
+    if kind == tarneeb_engine.EVENT_DEAL:
+        return f"{name} round={value}"
+    if kind == tarneeb_engine.EVENT_BID:
+        return f"seat {seat} {name} {value}"
+    if kind == tarneeb_engine.EVENT_TRUMP:
+        return f"seat {seat} {name} {cards.SUITS[value]}"
+    if kind == tarneeb_engine.EVENT_CARD:
+        rank, suit = cards.card_tuple(value)
+        return f"seat {seat} {name} {rank}{suit}"
+    if kind == tarneeb_engine.EVENT_TRICK:
+        return f"{name} {value} won by seat {seat}"
+    if kind == tarneeb_engine.EVENT_SCORE:
+        return f"{name} team {seat + 1} +{value}"
+    if kind == tarneeb_engine.EVENT_PASS:
+        return f"seat {seat} {name}"
+    return name
+
+def _apply(engine: TarneebEngine, event: Event):
+    kind, seat, value = event
+    if kind == tarneeb_engine.EVENT_BID:
+        engine.bid(seat, value)
+    elif kind == tarneeb_engine.EVENT_PASS:
+        engine.pass_bid(seat)
+    elif kind == tarneeb_engine.EVENT_TRUMP:
+        engine.choose_trump(seat, value)
+    elif kind == tarneeb_engine.EVENT_CARD:
+        engine.play(seat, value)
+    elif kind == tarneeb_engine.EVENT_NEXT_ROUND:
+        engine.next_round()
+
+def replay(events: Iterable[Event]) -> Optional[TarneebEngine]:
+    """Rebuild a game by feeding its logged actions through a fresh engine
+    
+    Every event the engine emits (deals, trick winners, scores) must match the
+    log record for record, otherwise ReplayError is raised. Returns the engine
+    in its final state, or None if the game never started.
+    """
+    engine = None
+    produced: List[Event] = []
+    index = 0
+    for position, event in enumerate(events):
+        if event[0] == tarneeb_engine.EVENT_START:
+            engine = TarneebEngine(random.Random(event[2]))
+            engine.recorder = lambda *record: produced.append(record)
+            produced.clear()
+            index = 0
+            engine.start_game()
+            continue
+        if engine is None:
+            raise ReplayError(f"Event {position} ({describe(event)}) comes before the game started")
+        
+        if event[0] in tarneeb_engine.ACTION_EVENTS and index == len(produced):
+            try:
+                _apply(engine, event)
+            except ValueError as e:
+                raise ReplayError(f"Event {position} ({describe(event)}) is illegal: {e}") from e
+        
+        if index == len(produced) or produced[index] != tuple(event):
+            expected = describe(produced[index]) if index < len(produced) else "nothing"
+            raise ReplayError(f"Event {position} ({describe(event)}) does not match the replay ({expected})")
+        index += 1
+    return engine
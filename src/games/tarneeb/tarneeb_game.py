@@ -2,48 +2,175 @@ import discord
 import random
 import asyncio
 import logging
+import os
+import secrets
+import struct
+import time
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 from ..base_game import BaseGame
+from ... import message_scheduler, metrics
+from ...logging_setup import current_game
+from . import cards
+from .cards import SUITS, SUIT_NAMES, SUIT_INDEX
+from . import engine as tarneeb_engine
+from .engine import TarneebEngine
 from .player import Player, AIPlayer
+from . import ai_pool
 from .card_ui import CardUI
 from .game_state_embed import GameStateEmbed
 
 logger = logging.getLogger(__name__)
 
-# Card definitions
-SUITS = ["♠", "♣", "♥", "♦"]
-SUIT_NAMES = {"♠": "Spades", "♣": "Clubs", "♥": "Hearts", "♦": "Diamonds"}
-RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+# Bot strength: "medium" (greedy rules) or "hard" (Monte Carlo card play)
+BOT_AI_CONFIG = {
+    'difficulty': os.getenv("TARNEEB_BOT_DIFFICULTY", "medium"),
+    'time_budget': int(os.getenv("TARNEEB_BOT_TIME_BUDGET_MS", "50")) / 1000
+}
+
+# Seconds a human has to act in each phase before a bot acts for them (0 = no clock)
+TURN_TIMEOUTS = {
+    'bidding': int(os.getenv("TARNEEB_BID_TIMEOUT_S", "60")),
+    'tarneeb_selection': int(os.getenv("TARNEEB_TRUMP_TIMEOUT_S", "60")),
+    'playing': int(os.getenv("TARNEEB_CARD_TIMEOUT_S", "90"))
+}
+# Turns in a row a human may miss before a bot takes their seat for good
+MAX_MISSED_TURNS = int(os.getenv("TARNEEB_MAX_MISSED_TURNS", "2"))
+
+# Snapshot header: version, game id (4 bytes), prompt nonce, seed
+SNAPSHOT_VERSION = 2
+_SNAPSHOT_HEADER = struct.Struct("<B4sII")
+
+def parse_int(arg: str) -> Optional[int]:
+    """The number in a custom_id argument, None if it isn't one (custom_ids can be forged)"""
+    try:
+        return int(arg)
+    except ValueError:
+        return None
+
+def _pack_str(value: str) -> bytes:
+    encoded = value.encode()
+    return struct.pack("<H", len(encoded)) + encoded
+
+def _unpack_str(data: bytes, offset: int) -> Tuple[str, int]:
+    (length,) = struct.unpack_from("<H", data, offset)
+    start = offset + 2
+    return data[start:start + length].decode(), start + length
 
 class TarneebGame(BaseGame):
     """Tarneeb card game implementation"""
     
+    # Pacing between automatic steps, in seconds
+    BOT_THINK_DELAY = 1
+    TRICK_PAUSE = 2
+    ROUND_END_PAUSE = 3
+    ROUND_START_PAUSE = 2
+    TABLE_EDIT_DELAY = 0.5  # Table updates within this window are sent as one edit
+    
     def __init__(self, channel_id: int, creator_id: str, creator_name: str):
-        super().__init__(channel_id, creator_id, creator_name, "Tarneeb")
+        # Rules and round state live in the headless engine; this class renders it.
+        # Deals and bot decisions come from the seed, so the event log replays exactly.
+        self.seed = secrets.randbits(32)
+        self.engine = TarneebEngine(random.Random(self.seed))
+        self.engine.recorder = self.record_event
+        super().__init__(channel_id, creator_id, creator_name, "tarneeb")
         self.max_players = 4
         self.min_players = 4
         
         # Tarneeb-specific attributes
-        self.round_number = 1
-        self.current_bid = 0
-        self.highest_bidder: Optional[Player] = None
-        self.bidding_turn = 0
-        self.passes_count = 0
-        self.current_turn_index = 0
-        self.tricks_won = {}
-        self.teams_scores = [0, 0]
-        self.tarneeb_suit: Optional[str] = None
-        self.played_cards = []  # List of (player, card) tuples
-        self.lead_suit: Optional[str] = None
-        self.deck = []
         self.waiting_for_card_from: Optional[str] = None
         self.current_card_view: Optional[discord.ui.View] = None
         self.current_ephemeral_embed: Optional[discord.Embed] = None
         
+        # Game loop: actions from interactions are queued and applied one at a time
+        self.actions: asyncio.Queue = asyncio.Queue()
+        self.loop_task: Optional[asyncio.Task] = None
+        self.channel = None
+        self.bot = None
+        self.paused = 0.0  # Total seconds spent in pause()
+        self.turn_timer = None  # Clock on the current human prompt (see TurnTimers)
+        self.missed_turns: Dict[int, int] = {}  # seat -> turns in a row a bot played for them
+        
+        # Live table message for the current phase, edited as the game moves on
+        self.table: Optional[asyncio.Future] = None
+        self.prompt_view: Optional[discord.ui.View] = None  # Buttons on the table, stopped once replaced
+        
         # Convert players list to Player objects
         self.player_objects: List[Player] = []
+        self.seats: Dict[str, int] = {}  # player id -> seat
+        
+        # Interaction routing: custom_ids are "game_id:round:nonce:action[:arg]" and the
+        # nonce changes with every prompt, so buttons from earlier prompts are rejected
+        self.prompt_nonce = 0
+        self.claimed_prompt: Optional[Tuple[int, int]] = None  # (round, nonce) whose move is queued
+        self.interaction_handlers = {
+            'bid': self.handle_bid,
+            'pass': self.handle_pass,
+            'tarneeb': self.handle_tarneeb,
+            'cards': self.handle_show_cards,
+            'card': self.handle_card
+        }
+    
+    # Engine state, exposed with Player objects and suit symbols for the Discord layer
+    @property
+    def state(self) -> str:
+        return self.engine.state
+    
+    @state.setter
+    def state(self, value: str):
+        self.engine.state = value
+    
+    @property
+    def round_number(self) -> int:
+        return self.engine.round_number
+    
+    @property
+    def current_bid(self) -> int:
+        return self.engine.current_bid
+    
+    @property
+    def highest_bidder(self) -> Optional[Player]:
+        seat = self.engine.highest_bidder
+        return self.player_objects[seat] if seat is not None else None
+    
+    @property
+    def bidding_turn(self) -> int:
+        return self.engine.bidding_turn
+    
+    @property
+    def passes_count(self) -> int:
+        return self.engine.passes_count
+    
+    @property
+    def current_turn_index(self) -> int:
+        return self.engine.current_turn
+    
+    @property
+    def tricks_won(self) -> Dict[str, int]:
+        return {player.id: self.engine.tricks_won[seat] for seat, player in enumerate(self.player_objects)}
+    
+    @property
+    def teams_scores(self) -> List[int]:
+        return self.engine.teams_scores
+    
+    @property
+    def tarneeb_suit(self) -> Optional[str]:
+        return SUITS[self.engine.trump] if self.engine.trump is not None else None
+    
+    @property
+    def lead_suit(self) -> Optional[str]:
+        return SUITS[self.engine.lead_suit] if self.engine.lead_suit is not None else None
+    
+    @property
+    def played_cards(self) -> List[Tuple[Player, Tuple[str, str]]]:
+        """Cards in the current trick as (player, card) tuples"""
+        return [(self.player_objects[seat], cards.card_tuple(card)) for seat, card in self.engine.trick]
+    
+    def _sync_hands(self):
+        """Copy the engine's hand masks onto the Player objects"""
+        for player, mask in zip(self.player_objects, self.engine.hands):
+            player.mask = mask
     
     def add_player(self, user_id: str, name: str) -> bool:
         """Add a player to the game"""
@@ -52,21 +179,32 @@ class TarneebGame(BaseGame):
         if self.is_player_in_game(user_id):
             return False
         
+        self._seat_player(user_id, name, is_bot=False)
+        
+        logger.info(f"👤 Player {name} joined Tarneeb game in channel {self.channel_id}")
+        self.notify_change()
+        return True
+    
+    def _seat_player(self, user_id: str, name: str, is_bot: bool):
+        """Add a player (or bot) to the next free seat"""
         # Add to players list
         player_data = {
             'id': user_id,
             'name': name,
-            'is_bot': False,
+            'is_bot': is_bot,
             'joined_at': datetime.now()
         }
         self.players.append(player_data)
         
-        # Create Player object
-        player_obj = Player(user_id, name)
+        # Create Player object; each bot gets its own RNG derived from the game seed
+        seat = len(self.player_objects)
+        if is_bot:
+            player_obj = Player(user_id, name, is_bot=True, ai_config=BOT_AI_CONFIG,
+                                rng=random.Random(self.seed * 4 + seat))
+        else:
+            player_obj = Player(user_id, name)
+        self.seats[user_id] = seat
         self.player_objects.append(player_obj)
-        
-        logger.info(f"👤 Player {name} joined Tarneeb game in channel {self.channel_id}")
-        return True
     
     def start_game(self):
         """Start the game with current players + bots"""
@@ -82,480 +220,622 @@ class TarneebGame(BaseGame):
             bot_name = random.choice(available_names)
             used_bot_names.append(bot_name)
             bot_id = f"bot_{len(self.players)}"
-            
-            # Add bot to players list
-            bot_data = {
-                'id': bot_id,
-                'name': bot_name,
-                'is_bot': True,
-                'joined_at': datetime.now()
-            }
-            self.players.append(bot_data)
-            
-            # Create Player object for bot
-            bot_player = Player(bot_id, bot_name, is_bot=True)
-            self.player_objects.append(bot_player)
+            self._seat_player(bot_id, bot_name, is_bot=True)
         
-        # Initialize game state
-        self.state = "bidding"
-        self.deal_cards()
-        self.bidding_turn = 0
-        self.current_turn_index = 0
-        
-        # Initialize tricks won tracking
-        for player in self.player_objects:
-            self.tricks_won[player.id] = 0
+        # Initialize game state and deal the first round
+        self.record_event(tarneeb_engine.EVENT_START, -1, self.seed)
+        self.engine.start_game()
+        self._sync_hands()
+        self.notify_change()
         
         logger.info(f"🎮 Tarneeb game started in channel {self.channel_id} with {len(self.players)} players")
     
     def deal_cards(self):
         """Deal 13 cards to each player"""
-        # Create and shuffle deck
-        self.deck = [(rank, suit) for suit in SUITS for rank in RANKS]
-        random.shuffle(self.deck)
-        
-        # Deal cards
-        for i, card in enumerate(self.deck):
-            player_index = i % 4
-            self.player_objects[player_index].add_card(card)
+        self.engine.deal()
+        self._sync_hands()
         
-        logger.info(f"🃏 Dealt cards to {len(self.player_objects)} players")
+        logger.debug(f"🃏 Dealt cards to {len(self.player_objects)} players")
     
     def get_player_object(self, user_id: str) -> Optional[Player]:
         """Get Player object by user ID"""
-        return next((p for p in self.player_objects if p.id == user_id), None)
+        seat = self.seats.get(str(user_id))
+        return self.player_objects[seat] if seat is not None else None
+    
+    def interaction_scope(self) -> str:
+        """custom_id prefix for the buttons of the current prompt"""
+        return f"{self.game_id}:{self.round_number}:{self.prompt_nonce}"
+    
+    def new_prompt_scope(self) -> str:
+        """Start a new prompt, invalidating every button posted before it"""
+        self.prompt_nonce += 1
+        return self.interaction_scope()
     
     def end_game(self, reason: str = "Game ended"):
         """End the game"""
         self.state = "finished"
+        self.stop_loop()
+        self.notify_change()
         logger.info(f"🏁 Tarneeb game ended in channel {self.channel_id}: {reason}")
     
     def get_game_state_embed(self) -> discord.Embed:
         """Get current game state as embed"""
         return GameStateEmbed.create_game_state_embed(self)
     
+    def snapshot(self) -> bytes:
+        """Compact binary snapshot: game id, prompt nonce, creator and seats, then the engine"""
+        parts = [
+            _SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, bytes.fromhex(self.game_id), self.prompt_nonce, self.seed),
+            _pack_str(self.creator_id),
+            _pack_str(self.creator_name),
+            bytes([len(self.players)])
+        ]
+        for player in self.players:
+            parts += [_pack_str(player['id']), _pack_str(player['name']), bytes([player.get('is_bot', False)])]
+        parts.append(self.engine.to_bytes())
+        return b"".join(parts)
+    
+    @classmethod
+    def restore(cls, channel_id: int, data: bytes) -> "TarneebGame":
+        """Rebuild a game from snapshot() output"""
+        version, game_id, prompt_nonce, seed = _SNAPSHOT_HEADER.unpack_from(data)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        
+        offset = _SNAPSHOT_HEADER.size
+        creator_id, offset = _unpack_str(data, offset)
+        creator_name, offset = _unpack_str(data, offset)
+        game = cls(channel_id, creator_id, creator_name)
+        game.game_id = game_id.hex()
+        game.prompt_nonce = prompt_nonce
+        game.seed = seed
+        
+        count = data[offset]
+        offset += 1
+        for _ in range(count):
+            user_id, offset = _unpack_str(data, offset)
+            name, offset = _unpack_str(data, offset)
+            game._seat_player(user_id, name, is_bot=bool(data[offset]))
+            offset += 1
+        
+        game.engine = TarneebEngine.from_bytes(data[offset:], random.Random(seed))
+        game.engine.recorder = game.record_event
+        game._sync_hands()
+        return game
+    
+    # Game loop: one task per game applies queued actions and runs bot turns in order
+    def start_loop(self, channel, bot):
+        """Start the game's loop task, which posts to channel until the game ends"""
+        self.channel = channel
+        self.bot = bot
+        self.loop_task = asyncio.create_task(self.run_loop(), name=f"tarneeb-{self.channel_id}")
+    
+    def stop_loop(self):
+        """Cancel the loop task (does nothing when called from inside it)"""
+        task = self.loop_task
+        if task is None or task.done():
+            return
+        try:
+            current = asyncio.current_task()
+        except RuntimeError:
+            current = None
+        if task is not current:
+            task.cancel()
+        self.cancel_turn_timer()
+    
+    def release(self):
+        """Stop the loop and clocks and drop the views still waiting for clicks"""
+        self.stop_loop()
+        if self.prompt_view is not None:
+            self.prompt_view.stop()
+            self.prompt_view = None
+    
+    def send(self, content: Optional[str] = None, **kwargs) -> asyncio.Future:
+        """Queue a message for the game's channel on the bot's message scheduler"""
+        return self.bot.message_scheduler.send(self.channel, content, **kwargs)
+    
+    def update_table(self, view: Optional[discord.ui.View] = None):
+        """Show the current state on the table message, posting it if there is none
+
+        Updates are debounced, except prompts (a view for a human to act on), which
+        go out immediately. Passing no view removes the previous prompt's buttons.
+        """
+        embed = GameStateEmbed.create_table_embed(self)
+        priority = message_scheduler.PROMPT if view else message_scheduler.INFO
+        
+        # Clicks are routed by custom_id, so a replaced view only needs to leave discord.py's view store
+        if self.prompt_view is not None and self.prompt_view is not view:
+            self.prompt_view.stop()
+        self.prompt_view = view
+        if self.table is None:
+            self.table = self.send(embed=embed, view=view, priority=priority, editable=True)
+        else:
+            delay = 0 if view else self.TABLE_EDIT_DELAY
+            self.bot.message_scheduler.edit(self.channel, self.table, embed=embed, view=view,
+                                            priority=priority, delay=delay)
+    
+    def close_table(self):
+        """Finish the current table message; the next update posts a new one"""
+        if self.table is not None:
+            self.update_table()
+            self.table = None
+    
+    def submit(self, action: Tuple[str, int, object]):
+        """Queue an (action, seat, value) tuple for the game loop, claiming the current prompt
+        
+        Each prompt takes one move: further clicks on it are turned away until the
+        game loop applies or rejects the queued one.
+        """
+        self.claimed_prompt = (self.round_number, self.prompt_nonce)
+        self.actions.put_nowait((action, self.claimed_prompt, time.perf_counter()))
+    
+    async def run_loop(self):
+        """Advance the game until a human has to act, then wait for queued actions"""
+        current_game.set(self)  # Log records from this task carry the game's context
+        try:
+            await self.advance()
+            while self.state != "finished":
+                action, prompt, queued_at = await self.actions.get()
+                metrics.observe("action.ack_to_apply", time.perf_counter() - queued_at)
+                if prompt != (self.round_number, self.prompt_nonce):
+                    logger.debug(f"⌛ Dropped stale {action[0]} in channel {self.channel_id}")
+                    continue
+                try:
+                    if await self._timed(f"action.{action[0]}", self.apply_action(*action)):
+                        if action[0] != "timeout":
+                            self.missed_turns[action[1]] = 0
+                        self.notify_change()
+                        await self.advance()
+                    elif self.claimed_prompt == prompt:
+                        self.claimed_prompt = None  # Rejected, the player may try again
+                except Exception:
+                    logger.exception(f"❌ Error handling {action[0]} in channel {self.channel_id}")
+                    if self.claimed_prompt == prompt:
+                        self.claimed_prompt = None  # Let the player retry instead of waiting for the turn clock
+        except asyncio.CancelledError:
+            logger.info(f"🛑 Game loop cancelled in channel {self.channel_id}")
+            raise
+        except Exception:
+            logger.exception(f"❌ Game loop crashed in channel {self.channel_id}")
+    
+    async def advance(self):
+        """Run automatic steps (bot moves, round changes) until input is needed"""
+        while self.state != "finished" and await self._timed(f"phase.{self.state}", self.step()):
+            self.notify_change()
+        self.notify_change()
+        self.start_turn_timer()
+    
+    def waiting_seat(self) -> Optional[int]:
+        """Seat the game is waiting on, if the current phase takes a move"""
+        if self.state == "bidding":
+            return self.bidding_turn
+        if self.state == "tarneeb_selection":
+            return self.engine.highest_bidder
+        if self.state == "playing":
+            return self.current_turn_index
+        return None
+    
+    def start_turn_timer(self):
+        """Start the clock on the current prompt; a bot acts for the player when it runs out"""
+        self.cancel_turn_timer()
+        timers = getattr(self.bot, "turn_timers", None)
+        timeout = TURN_TIMEOUTS.get(self.state, 0)
+        seat = self.waiting_seat()
+        if timers is None or not timeout or seat is None or self.player_objects[seat].is_bot:
+            return
+        prompt = (self.round_number, self.prompt_nonce)
+        self.turn_timer = timers.call_later(timeout, self.on_turn_timeout, prompt, seat)
+    
+    def cancel_turn_timer(self):
+        if self.turn_timer is not None:
+            self.turn_timer.cancel()
+            self.turn_timer = None
+    
+    def on_turn_timeout(self, prompt: Tuple[int, int], seat: int):
+        """Queue a timeout unless the player moved (or the prompt changed) in the meantime"""
+        self.turn_timer = None
+        if prompt != (self.round_number, self.prompt_nonce) or self.claimed_prompt == prompt:
+            return
+        self.submit(("timeout", seat, None))
+    
+    async def play_for(self, seat: int) -> bool:
+        """Make the seat's move with the bot logic after its player ran out of time"""
+        player = self.player_objects[seat]
+        if player.ai_player is None:
+            player.ai_player = AIPlayer(**BOT_AI_CONFIG, rng=random.Random(self.seed * 4 + seat))
+        
+        missed = self.missed_turns.get(seat, 0) + 1
+        self.missed_turns[seat] = missed
+        metrics.increment("turn_timeouts")
+        if missed >= MAX_MISSED_TURNS:
+            player.is_bot = True
+            self.players[seat]['is_bot'] = True
+            metrics.increment("players_replaced")
+            self.notify_change()  # Frees the player to join another game
+            self.send(f"🤖 {player.name} missed {missed} turns in a row and has been replaced by a bot.")
+            logger.info(f"🤖 Replaced {player.name} with a bot in channel {self.channel_id}")
+        else:
+            self.send(f"⏰ {player.name} ran out of time, so a bot played for them. "
+                      f"After {MAX_MISSED_TURNS} missed turns in a row they will be replaced.")
+        
+        if self.state == "bidding":
+            bid = await self.ai_decision(player, "bid")
+            return await self.apply_action("bid", seat, bid) if bid > 0 else await self.apply_action("pass", seat, None)
+        if self.state == "tarneeb_selection":
+            return await self.apply_action("tarneeb", seat, await self.ai_decision(player, "trump"))
+        return await self.apply_action("card", seat, cards.card_tuple(await self.ai_decision(player, "card")))
+    
+    async def _timed(self, name: str, step):
+        """Await step and record its duration, not counting deliberate pauses"""
+        paused = self.paused
+        start = time.perf_counter()
+        try:
+            return await step
+        finally:
+            metrics.observe(name, time.perf_counter() - start - (self.paused - paused))
+    
+    async def pause(self, seconds: float):
+        """Sleep for pacing, scaled by the guild's pace; the time is left out of phase latencies"""
+        start = time.perf_counter()
+        try:
+            await asyncio.sleep(seconds * self.pace)
+        finally:
+            self.paused += time.perf_counter() - start
+    
+    async def step(self) -> bool:
+        """Run one step of the current phase; False when waiting for a human"""
+        if self.state == "bidding":
+            return await self.continue_bidding()
+        if self.state == "tarneeb_selection":
+            return await self.start_tarneeb_selection()
+        if self.state == "playing":
+            return await self.start_playing_turn()
+        if self.state == "round_over":
+            await self.start_next_round()
+            return True
+        return False
+    
+    async def apply_action(self, action: str, seat: int, value) -> bool:
+        """Apply a queued human action; False if it no longer fits the game state"""
+        player = self.player_objects[seat]
+        if action == "bid":
+            if self.state != "bidding" or seat != self.bidding_turn or value <= self.current_bid:
+                return False
+            outcome = self.engine.bid(seat, value)
+            logger.debug(f"💰 {player.name} bid {value} tricks")
+            await self.next_bidding_turn(outcome)
+        elif action == "pass":
+            if self.state != "bidding" or seat != self.bidding_turn:
+                return False
+            outcome = self.engine.pass_bid(seat)
+            logger.debug(f"⏭️ {player.name} passed")
+            await self.next_bidding_turn(outcome)
+        elif action == "tarneeb":
+            if self.state != "tarneeb_selection" or seat != self.engine.highest_bidder:
+                return False
+            await self.set_tarneeb_suit(value, player)
+        elif action == "card":
+            if self.state != "playing" or seat != self.current_turn_index:
+                return False
+            return await self.play_card(player, value)
+        elif action == "timeout":
+            if seat != self.waiting_seat():
+                return False
+            return await self.play_for(seat)
+        else:
+            logger.warning(f"⚠️ Unknown action {action} in channel {self.channel_id}")
+            return False
+        return True
+    
     async def handle_interaction(self, interaction: discord.Interaction, bot) -> bool:
         """Handle Discord UI interactions"""
-        if interaction.data.get("custom_id", "").startswith("bid_"):
-            bid_value = int(interaction.data["custom_id"].split("_")[1])
-            await self.handle_bid(interaction, bid_value, bot)
+        route = self.parse_custom_id(interaction.data.get("custom_id", ""))
+        if route is None or route[0] != self.game_id:
+            return False
+        
+        _, round_number, nonce, action, arg = route
+        handler = self.interaction_handlers.get(action)
+        if handler is None:
+            return False
+        
+        # Buttons are only valid for the prompt they were posted with
+        if round_number != self.round_number or nonce != self.prompt_nonce:
+            await interaction.response.send_message("⌛ This button is from an earlier turn!", ephemeral=True)
             return True
-        elif interaction.data.get("custom_id") == "pass":
-            await self.handle_pass(interaction, bot)
+        
+        seat = self.seats.get(str(interaction.user.id))
+        if seat is None:
+            await interaction.response.send_message("❌ You're not in this game!", ephemeral=True)
             return True
-        elif interaction.data.get("custom_id", "").startswith("tarneeb_"):
-            suit = interaction.data["custom_id"].split("_")[1]
-            player = self.get_player_object(interaction.user.id)
-            if player == self.highest_bidder:
-                await interaction.response.send_message("Tarneeb suit selected!", ephemeral=True)
-                await self.set_tarneeb_suit(interaction.channel, bot, suit, player)
-                return True
-            else:
-                await interaction.response.send_message("Only the highest bidder can choose the tarneeb suit!", ephemeral=True)
-                return True
-        elif interaction.data.get("custom_id", "").startswith("show_my_cards_"):
-            # Handle showing cards to current player
-            player_id_from_button = interaction.data["custom_id"].split("_")[-1]
-            player = self.get_player_object(interaction.user.id)
-            
-            if player and str(player.id) == player_id_from_button and player.id == self.waiting_for_card_from:
-                # Create ephemeral card selection embed
-                embed = discord.Embed(
-                    title="🃏 Choose Your Card",
-                    description="Select a card to play (only you can see this):",
-                    color=0x0099ff
-                )
-                
-                # Show game context
-                suit_names = {'♠': 'Spades', '♥': 'Hearts', '♦': 'Diamonds', '♣': 'Clubs'}
-                if self.lead_suit:
-                    embed.add_field(name="Must Follow", value=f"{self.lead_suit} {suit_names[self.lead_suit]}", inline=True)
-                embed.add_field(name="Trump", value=f"{self.tarneeb_suit} {suit_names[self.tarneeb_suit]}", inline=True)
-                
-                # Show cards played so far
-                if self.played_cards:
-                    cards_played = []
-                    for p, card in self.played_cards:
-                        card_str = CardUI.format_card(card)
-                        cards_played.append(f"**{p.name}**: {card_str}")
-                    embed.add_field(name="Cards Played", value="\n".join(cards_played), inline=False)
-                
-                view = CardUI.create_card_selection_view(player.hand, self.lead_suit, self.tarneeb_suit)
-                await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
-                return True
-            else:
-                await interaction.response.send_message("It's not your turn!", ephemeral=True)
-                return True
-        elif interaction.data.get("custom_id", "").startswith("card_"):
-            card_data = interaction.data["custom_id"].split("_")[1:]
-            rank, suit = card_data[0], card_data[1]
-            card = (rank, suit)
-            player = self.get_player_object(interaction.user.id)
-            if player and player == self.player_objects[self.current_turn_index]:
-                try:
-                    await interaction.response.defer(ephemeral=True)
-                    if await self.play_card(interaction.channel, bot, player, card):
-                        await interaction.followup.send("Card played!", ephemeral=True)
-                    else:
-                        await interaction.followup.send("Invalid card play!", ephemeral=True)
-                except:
-                    # Interaction already responded to, just play the card
-                    await self.play_card(interaction.channel, bot, player, card)
-                return True
-            else:
-                try:
-                    await interaction.response.send_message("It's not your turn!", ephemeral=True)
-                except:
-                    pass
-                return True
         
-        return False
+        # A double click or a second button on the same prompt must not become a second move
+        if action != 'cards' and self.claimed_prompt == (round_number, nonce):
+            await interaction.response.send_message("⏳ Your move is already being played!", ephemeral=True)
+            return True
+        
+        # Handlers answer right away and leave the move itself to the game loop
+        await handler(interaction, seat, arg)
+        return True
     
-    # All the existing Tarneeb game methods remain the same...
-    async def handle_bid(self, interaction: discord.Interaction, bid: int, bot):
+    async def handle_bid(self, interaction: discord.Interaction, seat: int, arg: str):
         """Handle a bid from a player"""
-        player = self.get_player_object(interaction.user.id)
-        current_player = self.player_objects[self.bidding_turn]
-        
-        if not player or player != current_player or player.is_bot:
+        if self.state != "bidding" or seat != self.bidding_turn:
             await interaction.response.send_message("It's not your turn to bid!", ephemeral=True)
             return
         
+        bid = parse_int(arg)
+        if bid is None or bid > tarneeb_engine.MAX_BID:
+            await interaction.response.send_message("Invalid bid!", ephemeral=True)
+            return
         if bid <= self.current_bid:
             await interaction.response.send_message(f"Bid must be higher than {self.current_bid}!", ephemeral=True)
             return
         
-        self.current_bid = bid
-        self.highest_bidder = player
-        self.passes_count = 0
-        
-        logger.info(f"💰 {player.name} bid {bid} tricks")
+        self.submit(("bid", seat, bid))
         await interaction.response.send_message(f"Bid of {bid} tricks accepted!", ephemeral=True)
-        await self.next_bidding_turn(interaction.channel, bot)
     
-    async def handle_pass(self, interaction: discord.Interaction, bot):
+    async def handle_pass(self, interaction: discord.Interaction, seat: int, arg: str):
         """Handle a pass from a player"""
-        player = self.get_player_object(interaction.user.id)
-        current_player = self.player_objects[self.bidding_turn]
-        
-        if not player or player != current_player or player.is_bot:
+        if self.state != "bidding" or seat != self.bidding_turn:
             await interaction.response.send_message("It's not your turn to bid!", ephemeral=True)
             return
         
-        self.passes_count += 1
-        logger.info(f"⏭️ {player.name} passed")
+        self.submit(("pass", seat, None))
         await interaction.response.send_message("Pass registered!", ephemeral=True)
-        await self.next_bidding_turn(interaction.channel, bot)
     
-    async def next_bidding_turn(self, channel, bot):
-        """Move to next bidding turn"""
-        self.bidding_turn = (self.bidding_turn + 1) % 4
-        
-        # Check if bidding is over
-        if self.passes_count >= 3 and self.highest_bidder:
-            await self.end_bidding_phase(channel, bot)
+    async def handle_tarneeb(self, interaction: discord.Interaction, seat: int, suit: str):
+        """Handle the highest bidder's choice of tarneeb suit"""
+        if self.state != "tarneeb_selection" or seat != self.engine.highest_bidder:
+            await interaction.response.send_message("Only the highest bidder can choose the tarneeb suit!", ephemeral=True)
             return
-        elif self.passes_count >= 4:
-            # All players passed, restart round
-            await channel.send("🔄 All players passed! Starting new round...")
-            self.restart_round()
-            await self.continue_bidding(channel, bot)
+        
+        if suit not in SUIT_INDEX:
+            await interaction.response.send_message("Invalid suit!", ephemeral=True)
             return
         
-        await self.continue_bidding(channel, bot)
+        self.submit(("tarneeb", seat, suit))
+        await interaction.response.send_message("Tarneeb suit selected!", ephemeral=True)
     
-    async def continue_bidding(self, channel, bot):
-        """Continue bidding with current player"""
-        current_player = self.player_objects[self.bidding_turn]
+    async def handle_show_cards(self, interaction: discord.Interaction, seat: int, arg: str):
+        """Show the current player their playable cards privately"""
+        if self.state != "playing" or seat != self.current_turn_index:
+            await interaction.response.send_message("It's not your turn!", ephemeral=True)
+            return
         
-        # Create bidding embed
+        player = self.player_objects[seat]
+        
+        # Create ephemeral card selection embed
         embed = discord.Embed(
-            title="💰 Bidding Phase",
-            description=f"**{current_player.name}**'s turn to bid",
-            color=0xffd700
+            title="🃏 Choose Your Card",
+            description="Select a card to play (only you can see this):",
+            color=0x0099ff
         )
         
-        embed.add_field(name="Current Bid", value=str(self.current_bid) if self.current_bid > 0 else "No bids yet", inline=True)
-        embed.add_field(name="Highest Bidder", value=self.highest_bidder.name if self.highest_bidder else "None", inline=True)
-        embed.add_field(name="Round", value=str(self.round_number), inline=True)
+        # Show game context
+        if self.lead_suit:
+            embed.add_field(name="Must Follow", value=f"{self.lead_suit} {SUIT_NAMES[self.lead_suit]}", inline=True)
+        embed.add_field(name="Trump", value=f"{self.tarneeb_suit} {SUIT_NAMES[self.tarneeb_suit]}", inline=True)
+        
+        # Show cards played so far
+        if self.played_cards:
+            cards_played = []
+            for p, card in self.played_cards:
+                card_str = CardUI.format_card(card)
+                cards_played.append(f"**{p.name}**: {card_str}")
+            embed.add_field(name="Cards Played", value="\n".join(cards_played), inline=False)
+        
+        view = CardUI.create_card_selection_view(self.interaction_scope(), player.mask, self.lead_suit, self.tarneeb_suit)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+    
+    async def handle_card(self, interaction: discord.Interaction, seat: int, arg: str):
+        """Handle a card chosen from the private card selection"""
+        if self.state != "playing" or seat != self.current_turn_index:
+            await interaction.response.send_message("It's not your turn!", ephemeral=True)
+            return
+        
+        card = parse_int(arg)
+        if card is None or not 0 <= card < 52 or not self.engine.is_legal(seat, card):
+            await interaction.response.send_message("Invalid card play!", ephemeral=True)
+            return
+        
+        self.submit(("card", seat, cards.card_tuple(card)))
+        await interaction.response.send_message("Card played!", ephemeral=True)
+    
+    async def next_bidding_turn(self, outcome: str):
+        """Render the outcome of a bid or pass"""
+        # Check if bidding is over
+        if outcome == tarneeb_engine.BIDDING_COMPLETE:
+            await self.end_bidding_phase()
+        elif outcome == tarneeb_engine.REDEAL:
+            # All players passed, the engine has already redealt the round
+            self._sync_hands()
+            self.close_table()
+            self.send("🔄 All players passed! Starting new round...")
+    
+    async def continue_bidding(self) -> bool:
+        """Prompt the current bidder, or make the bot's bid"""
+        current_player = self.player_objects[self.bidding_turn]
         
         if current_player.is_bot:
-            # Bot makes bid decision
-            await asyncio.sleep(1)  # Simulate thinking
-            bot_bid = current_player.ai_player.make_bid_decision(
-                current_player.hand, self.current_bid, self.passes_count, self.bidding_turn
-            )
+            # Bots bidding in a row share one thinking pause and one table update
+            await self.pause(self.BOT_THINK_DELAY)  # Simulate thinking
+            outcome = tarneeb_engine.BIDDING
+            while outcome == tarneeb_engine.BIDDING and self.player_objects[self.bidding_turn].is_bot:
+                outcome = await self.make_bot_bid(self.player_objects[self.bidding_turn])
             
-            if bot_bid > 0:
-                self.current_bid = bot_bid
-                self.highest_bidder = current_player
-                self.passes_count = 0
-                embed.add_field(name="Bot Decision", value=f"Bids {bot_bid} tricks", inline=False)
-                logger.info(f"🤖 {current_player.name} (bot) bid {bot_bid}")
-            else:
-                self.passes_count += 1
-                embed.add_field(name="Bot Decision", value="Passes", inline=False)
-                logger.info(f"🤖 {current_player.name} (bot) passed")
-            
-            await channel.send(embed=embed)
-            await self.next_bidding_turn(channel, bot)
-        else:
-            # Human player's turn
-            view = CardUI.create_bidding_view()
-            await channel.send(embed=embed, view=view)
-    
-    async def end_bidding_phase(self, channel, bot):
-        """End bidding and start tarneeb selection"""
-        embed = discord.Embed(
-            title="✅ Bidding Complete",
-            description=f"**{self.highest_bidder.name}** won with {self.current_bid} tricks",
-            color=0x00ff00
-        )
+            self.update_table()
+            await self.next_bidding_turn(outcome)
+            return True
         
-        logger.info(f"✅ Bidding complete - {self.highest_bidder.name} won with {self.current_bid} tricks")
-        await channel.send(embed=embed)
-        await self.start_tarneeb_selection(channel, bot)
+        # Human player's turn
+        self.update_table(view=CardUI.create_bidding_view(self.new_prompt_scope()))
+        return False
     
-    async def start_tarneeb_selection(self, channel, bot):
-        """Start tarneeb suit selection phase"""
-        self.state = "tarneeb_selection"
-        
+    async def make_bot_bid(self, player: Player) -> str:
+        """Bid or pass for the bot whose turn it is; returns the bidding outcome"""
+        with metrics.timed("ai.bid"):
+            bot_bid = await self.ai_decision(player, "bid")
+        
+        if bot_bid > 0:
+            logger.debug(f"🤖 {player.name} (bot) bid {bot_bid}")
+            return self.engine.bid(self.bidding_turn, bot_bid)
+        logger.debug(f"🤖 {player.name} (bot) passed")
+        return self.engine.pass_bid(self.bidding_turn)
+    
+    async def end_bidding_phase(self):
+        """Show the bidding winner on the table"""
+        logger.debug(f"✅ Bidding complete - {self.highest_bidder.name} won with {self.current_bid} tricks")
+        self.update_table()
+    
+    async def start_tarneeb_selection(self) -> bool:
+        """Prompt the highest bidder for the tarneeb suit, or let the bot choose"""
         if self.highest_bidder.is_bot:
             # Bot chooses tarneeb suit
-            await asyncio.sleep(1)
-            chosen_suit = self.highest_bidder.ai_player.choose_tarneeb_suit(self.highest_bidder.hand)
-            await self.set_tarneeb_suit(channel, bot, chosen_suit, self.highest_bidder)
-        else:
-            # Human player chooses
-            embed = discord.Embed(
-                title="🎯 Choose Tarneeb Suit",
-                description=f"**{self.highest_bidder.name}**, choose the tarneeb (trump) suit:",
-                color=0xff6600
-            )
-            
-            view = CardUI.create_tarneeb_selection_view()
-            await channel.send(embed=embed, view=view)
-    
-    async def set_tarneeb_suit(self, channel, bot, suit: str, player: Player):
-        """Set the tarneeb suit and start playing"""
-        self.tarneeb_suit = suit
-        self.state = "playing"
-        
-        # Show chosen tarneeb
-        suit_name = SUIT_NAMES[suit]
-        embed = discord.Embed(
-            title="🎯 Tarneeb Suit Chosen",
-            description=f"**{player.name}** chose **{suit} {suit_name}** as tarneeb",
-            color=0xff6600
-        )
-        
-        embed.add_field(name="Bid", value=f"{self.current_bid} tricks", inline=True)
-        embed.add_field(name="Bidding Team", value="Team 1" if self.player_objects.index(player) % 2 == 0 else "Team 2", inline=True)
+            await self.pause(self.BOT_THINK_DELAY)
+            with metrics.timed("ai.trump"):
+                chosen_suit = await self.ai_decision(self.highest_bidder, "trump")
+            await self.set_tarneeb_suit(chosen_suit, self.highest_bidder)
+            return True
         
-        logger.info(f"🎯 {player.name} chose {suit} {suit_name} as tarneeb")
-        await channel.send(embed=embed)
+        # Human player chooses
+        self.update_table(view=CardUI.create_tarneeb_selection_view(self.new_prompt_scope()))
+        return False
+    
+    async def set_tarneeb_suit(self, suit: str, player: Player):
+        """Set the tarneeb suit; play starts with the first player on a new table"""
+        self.engine.choose_trump(self.player_objects.index(player), SUIT_INDEX[suit])
         
-        # Start playing phase
-        self.current_turn_index = 0  # Start with first player
-        await self.start_playing_turn(channel, bot)
+        logger.debug(f"🎯 {player.name} chose {suit} {SUIT_NAMES[suit]} as tarneeb")
+        self.close_table()
+        self.update_table()
     
-    async def start_playing_turn(self, channel, bot):
-        """Start a player's turn in the playing phase"""
+    async def start_playing_turn(self) -> bool:
+        """Prompt the current player for a card, or play the bot's card"""
         current_player = self.player_objects[self.current_turn_index]
         
         if current_player.is_bot:
-            # Bot plays automatically
-            await asyncio.sleep(1)  # Simulate thinking
-            card_choice = current_player.ai_player.choose_card_to_play(
-                current_player.hand,
-                self.lead_suit,
-                self.tarneeb_suit,
-                [card for _, card in self.played_cards]
-            )
-            await self.play_card(channel, bot, current_player, card_choice)
-        else:
-            # Human player's turn - show public game state with private card button
-            embed = GameStateEmbed.create_playing_embed(self, current_player)
-            
-            # Create a view with a button for the current player to see their cards
-            view = CardUI.create_show_cards_button_view(current_player.id)
-            await channel.send(embed=embed, view=view)
-            
-            # Store card selection data for when player clicks the button
-            self.waiting_for_card_from = current_player.id
-    
-    async def play_card(self, channel, bot, player: Player, card: Tuple[str, str]) -> bool:
-        """Play a card and handle game logic"""
-        # Validate card play
-        if card not in player.hand:
-            return False
+            # Bots playing in a row within a trick share one thinking pause (table edits are merged)
+            await self.pause(self.BOT_THINK_DELAY)  # Simulate thinking
+            while True:
+                completes_trick = len(self.engine.trick) == 3
+                with metrics.timed("ai.card"):
+                    card_choice = cards.card_tuple(await self.ai_decision(current_player, "card"))
+                await self.play_card(current_player, card_choice)
+                if completes_trick or self.state != "playing":
+                    break
+                current_player = self.player_objects[self.current_turn_index]
+                if not current_player.is_bot:
+                    break
+            return True
         
-        # Check if player must follow suit
-        if self.lead_suit and player.has_suit(self.lead_suit) and card[1] != self.lead_suit:
-            return False
+        # Human player's turn - show public game state with private card button
+        view = CardUI.create_show_cards_button_view(self.new_prompt_scope())
+        self.update_table(view=view)
         
-        # Remove card from hand and add to played cards
-        player.remove_card(card)
-        self.played_cards.append((player, card))
+        # Store card selection data for when player clicks the button
+        self.waiting_for_card_from = current_player.id
+        return False
+    
+    async def ai_decision(self, player: Player, kind: str):
+        """A bot's "bid", "trump" or "card" decision; expensive AI runs off the event loop
+        
+        With the bot's AI pool, a decision that misses its deadline falls back to the
+        medium heuristics. Without one, expensive AI runs in a thread on a copy of the engine.
+        """
+        seat = self.player_objects.index(player)
+        ai = player.ai_player
+        if not ai.is_expensive:
+            return ai_pool.decide(kind, self.engine, seat, ai)
+        
+        pool = getattr(self.bot, "ai_pool", None)
+        if pool is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, ai_pool.decide, kind, self.engine.copy(), seat, ai)
+        
+        decision = await pool.decide(kind, self.engine, seat, ai)
+        if decision is None:
+            decision = ai_pool.decide(kind, self.engine, seat, AIPlayer("medium", rng=ai.rng))
+        return decision
+    
+    async def play_card(self, player: Player, card: Tuple[str, str]) -> bool:
+        """Play a card and show the result"""
+        # Validate card play (must hold the card and follow suit if possible)
+        seat = self.player_objects.index(player)
+        if card not in cards.CARD_IDS or not self.engine.is_legal(seat, cards.card_id(card)):
+            return False
         
-        # Set lead suit if first card
-        if not self.lead_suit:
-            self.lead_suit = card[1]
+        # Remove card from hand and add to the trick
+        outcome = self.engine.play(seat, cards.card_id(card))
+        player.mask = self.engine.hands[seat]
         
         # Show card played
-        card_str = CardUI.format_card(card)
-        embed = discord.Embed(
-            title="🎴 Card Played",
-            description=f"**{player.name}** played {card_str}",
-            color=0x0099ff
-        )
-        
-        logger.info(f"🎴 {player.name} played {card_str}")
-        await channel.send(embed=embed)
+        logger.debug(f"🎴 {player.name} played {CardUI.format_card(card)}")
+        self.update_table()
         
         # Check if trick is complete (4 cards played)
-        if len(self.played_cards) == 4:
-            await self.end_trick(channel, bot)
-        else:
-            # Next player's turn
-            self.current_turn_index = (self.current_turn_index + 1) % 4
-            await self.start_playing_turn(channel, bot)
+        if outcome != tarneeb_engine.NEXT_TURN:
+            await self.end_trick(outcome)
         
         return True
     
-    async def end_trick(self, channel, bot):
-        """End current trick and determine winner"""
-        # Find winning card
-        winning_card = None
-        winning_player = None
-        
-        # Check for trump cards first
-        trump_cards = [(p, c) for p, c in self.played_cards if c[1] == self.tarneeb_suit]
-        if trump_cards:
-            # Highest trump wins
-            winning_player, winning_card = max(trump_cards, key=lambda x: RANKS.index(x[1][0]))
+    async def end_trick(self, outcome: str):
+        """Handle the trick the engine just awarded (the table shows it as the last trick)"""
+        winner = self.engine.last_trick_winner
+        winning_card = next(card for seat, card in self.engine.last_trick if seat == winner)
+        logger.debug(f"🏆 {self.player_objects[winner].name} won the trick with {CardUI.format_card(cards.card_tuple(winning_card))}")
+        metrics.increment("tricks_completed")
+        
+        # Winner leads next; check if hand is complete (13 tricks)
+        if outcome != tarneeb_engine.TRICK_COMPLETE:
+            await self.end_round()
         else:
-            # Highest card of lead suit wins
-            lead_cards = [(p, c) for p, c in self.played_cards if c[1] == self.lead_suit]
-            if lead_cards:
-                winning_player, winning_card = max(lead_cards, key=lambda x: RANKS.index(x[1][0]))
-        
-        if winning_player:
-            # Award trick to winning player
-            self.tricks_won[winning_player.id] += 1
-            
-            # Show trick result
-            card_str = CardUI.format_card(winning_card)
-            embed = discord.Embed(
-                title="🏆 Trick Winner",
-                description=f"**{winning_player.name}** wins with {card_str}",
-                color=0x00ff00
-            )
-            
-            # Show all played cards
-            cards_summary = []
-            for player, card in self.played_cards:
-                card_display = CardUI.format_card(card)
-                if player == winning_player:
-                    cards_summary.append(f"**🏆 {player.name}: {card_display}**")
-                else:
-                    cards_summary.append(f"{player.name}: {card_display}")
-            
-            embed.add_field(name="Cards Played", value="\n".join(cards_summary), inline=False)
-            await channel.send(embed=embed)
-            
-            logger.info(f"🏆 {winning_player.name} won the trick with {card_str}")
-            
-            # Reset for next trick
-            self.played_cards = []
-            self.lead_suit = None
-            self.current_turn_index = self.player_objects.index(winning_player)
-            
-            # Check if hand is complete (13 tricks)
-            if sum(self.tricks_won.values()) >= 13:
-                await self.end_round(channel, bot)
-            else:
-                await asyncio.sleep(2)  # Brief pause
-                await self.start_playing_turn(channel, bot)
-    
-    async def end_round(self, channel, bot):
-        """End current round and calculate scores"""
-        # Calculate team tricks
-        team_tricks = [0, 0]
-        for i, player in enumerate(self.player_objects):
-            team_index = i % 2
-            team_tricks[team_index] += self.tricks_won.get(player.id, 0)
-        
-        # Determine if bid was made
-        bidding_team = self.player_objects.index(self.highest_bidder) % 2
-        bid_made = team_tricks[bidding_team] >= self.current_bid
-        
-        # Calculate points
-        if bid_made:
+            await self.pause(self.TRICK_PAUSE)  # Brief pause
+    
+    async def end_round(self):
+        """Show the round the engine just scored"""
+        result = self.engine.last_round
+        metrics.increment("rounds_completed")
+        team_tricks = result['team_tricks']
+        bidding_team = result['bidding_team']
+        points = result['points']
+        
+        if result['bid_made']:
             # Bidding team made their bid
-            points = self.current_bid
-            self.teams_scores[bidding_team] += points
             result_msg = f"🎉 Team {bidding_team + 1} made their bid of {self.current_bid}! (+{points} points)"
         else:
             # Bidding team failed
-            points = self.current_bid
-            other_team = 1 - bidding_team
-            self.teams_scores[other_team] += points
+            other_team = result['scoring_team']
             result_msg = f"💥 Team {bidding_team + 1} failed their bid! Team {other_team + 1} gets +{points} points"
         
-        # Show round results
+        # Show round results below the finished table
+        self.table = None
         embed = GameStateEmbed.create_round_end_embed(self, result_msg, team_tricks)
-        await channel.send(embed=embed)
+        self.send(embed=embed)
         
         logger.info(f"🏁 Round {self.round_number} complete - {result_msg}")
         
-        # Check for game winner (31 points)
-        if max(self.teams_scores) >= 31:
-            await self.end_game_final(channel, bot)
-        else:
-            # Start next round
-            await asyncio.sleep(3)
-            await self.start_next_round(channel, bot)
+        # Check for game winner (31 points); otherwise the loop starts the next round
+        if self.engine.state == "finished":
+            await self.end_game_final()
     
-    async def start_next_round(self, channel, bot):
+    async def start_next_round(self):
         """Start the next round"""
-        self.round_number += 1
-        self.restart_round()
+        await self.pause(self.ROUND_END_PAUSE)
+        self.engine.next_round()
+        self._sync_hands()
         
-        embed = discord.Embed(
-            title=f"🔄 Round {self.round_number}",
-            description="Starting new round...",
-            color=0x0099ff
-        )
-        
-        embed.add_field(name="Current Scores", value=f"Team 1: {self.teams_scores[0]}\nTeam 2: {self.teams_scores[1]}", inline=False)
-        
-        await channel.send(embed=embed)
-        await asyncio.sleep(2)
-        await self.continue_bidding(channel, bot)
+        # New table for the round's bidding
+        self.update_table()
+        await self.pause(self.ROUND_START_PAUSE)
     
     def restart_round(self):
-        """Reset round-specific variables"""
-        self.state = "bidding"
-        self.current_bid = 0
-        self.highest_bidder = None
-        self.bidding_turn = 0
-        self.passes_count = 0
-        self.current_turn_index = 0
-        self.tarneeb_suit = None
-        self.played_cards = []
-        self.lead_suit = None
-        
-        # Clear hands and redeal
-        for player in self.player_objects:
-            player.hand = []
-            self.tricks_won[player.id] = 0
-        
-        self.deal_cards()
-    
-    async def end_game_final(self, channel, bot):
+        """Reset round-specific variables and redeal"""
+        self.engine.start_round()
+        self._sync_hands()
+    
+    async def end_game_final(self):
         """End the game and show final results"""
-        winning_team = 0 if self.teams_scores[0] >= 31 else 1
+        winning_team = self.engine.winning_team
         
         embed = discord.Embed(
             title="🎉 Game Over!",
@@ -574,7 +854,7 @@ class TarneebGame(BaseGame):
         embed.add_field(name="Team 1", value="\n".join(team_members[0]), inline=True)
         embed.add_field(name="Team 2", value="\n".join(team_members[1]), inline=True)
         
-        await channel.send(embed=embed)
+        self.send(embed=embed)
         
         logger.info(f"🎉 Tarneeb game ended in channel {self.channel_id} - Team {winning_team + 1} wins!")
         
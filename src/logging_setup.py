@@ -0,0 +1,112 @@
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # "text" or "json" (one object per line)
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", "5"))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")  # e.g. "midnight" rotates by time instead of size
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")  # Per-logger levels, e.g. "src.games=DEBUG,discord=WARNING"
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Game whose code is running in the current task; the game loop and interaction handlers set it
+current_game: ContextVar[Optional[object]] = ContextVar("current_game", default=None)
+
+class GameContextFilter(logging.Filter):
+    """Stamps records with the game_id, channel_id and phase of the current game, if any"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        game = current_game.get()
+        record.game_id = getattr(game, "game_id", None)
+        record.channel_id = getattr(game, "channel_id", None)
+        record.phase = getattr(game, "state", None)
+        return True
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback in exc_text instead of folding it into the message"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None  # Tracebacks don't pickle or cross threads safely; exc_text carries it
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the game context fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for field in ('game_id', 'channel_id', 'phase'):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """"name=LEVEL,name=LEVEL" -> {name: LEVEL}"""
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def _file_handler(path: Path) -> logging.Handler:
+    if LOG_ROTATE_WHEN:
+        return logging.handlers.TimedRotatingFileHandler(path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUPS,
+                                                         encoding="utf-8")
+    return logging.handlers.RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                                                encoding="utf-8")
+
+def configure_logging() -> logging.handlers.QueueListener:
+    """Route every log record through a queue to a background thread that writes the files
+
+    Callers only pay for putting the record on the queue; formatting, disk writes and
+    rotation happen on the listener's thread. Stop the returned listener on shutdown
+    to flush what is left.
+    """
+    log_dir = Path(LOG_DIR)
+    log_dir.mkdir(exist_ok=True)
+    formatter = JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+
+    log_file = _file_handler(log_dir / "logs.log")
+    error_file = _file_handler(log_dir / "errors.log")
+    error_file.setLevel(logging.ERROR)
+    console = logging.StreamHandler()
+    for handler in (log_file, error_file, console):
+        handler.setFormatter(formatter)
+
+    records: queue.Queue = queue.Queue()
+    queue_handler = ContextQueueHandler(records)
+    queue_handler.addFilter(GameContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+    for name, level in parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = logging.handlers.QueueListener(records, log_file, error_file, console, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,357 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import discord
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Priorities: lower values are served first
+PROMPT = 0  # Turn prompts a player has to act on
+INFO = 1    # Informational updates (moves, results)
+
+# Discord limits on one message
+MAX_EMBEDS = 10
+MAX_CONTENT = 2000
+
+class TokenBucket:
+    """Token bucket that refills rate tokens per second up to capacity"""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> bool:
+        self._refill()
+        return self.tokens >= 1
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available"""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+class OutboundMessage:
+    """One queued send or edit; future resolves to the message (None on failure)
+
+    Edits have a target, the future of the message to edit, and are not sent
+    before not_before so that rapid updates can be merged. An editable send is
+    never merged with others, since an edit replaces the whole message.
+    """
+
+    def __init__(self, content: Optional[str], embeds: List[discord.Embed], view: Optional[discord.ui.View],
+                 priority: int, target: Optional[asyncio.Future] = None, delay: float = 0.0,
+                 editable: bool = False):
+        self.content = content
+        self.embeds = embeds
+        self.view = view
+        self.priority = priority
+        self.target = target
+        self.editable = editable
+        self.queued_at = time.monotonic()
+        self.not_before = self.queued_at + delay
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+class ChannelQueue:
+    """Pending messages and send budget for one channel"""
+
+    def __init__(self, channel, bucket: TokenBucket):
+        self.channel = channel
+        self.bucket = bucket
+        self.pending: Deque[OutboundMessage] = deque()
+        self.edits: Dict[asyncio.Future, OutboundMessage] = {}  # Pending edit per target message
+        self.busy = False  # A send is in flight; channel order is kept by sending one at a time
+        self.last_served = 0
+
+    @property
+    def priority(self) -> int:
+        return min(message.priority for message in self.pending)
+
+    def next_ready(self, now: float) -> Optional[int]:
+        """Index of the first pending message that may go out now
+
+        Only edits are ever held back, so sends behind a debounced edit go ahead of it
+        and a turn prompt never waits out a cosmetic edit's delay.
+        """
+        for index, message in enumerate(self.pending):
+            if message.not_before <= now:
+                return index
+        return None
+
+    def ready(self, now: float) -> bool:
+        """Whether a message may go out now"""
+        return bool(self.pending) and not self.busy and self.bucket.available() \
+            and self.next_ready(now) is not None
+
+    def take_batch(self, now: float) -> List[OutboundMessage]:
+        """Pop the longest run of ready sends that fits in one Discord message
+
+        An edit is always a batch of its own, and so is an editable send. Edits still
+        held back stay queued in place and the run continues past them; a ready edit
+        ends the run. A message with a view ends the batch, since only one view can be
+        attached.
+        """
+        index = self.next_ready(now)
+        first = self.pending[index]
+        if first.target is not None:
+            del self.pending[index]
+            del self.edits[first.target]
+            return [first]
+
+        pending = list(self.pending)
+        kept = pending[:index]
+        batch = []
+        embeds = 0
+        content = 0
+        while index < len(pending):
+            message = pending[index]
+            if message.target is not None:
+                if message.not_before <= now:
+                    break
+                kept.append(message)
+                index += 1
+                continue
+            length = len(message.content) + 1 if message.content else 0
+            if batch and (message.editable or embeds + len(message.embeds) > MAX_EMBEDS
+                          or content + length > MAX_CONTENT):
+                break
+            batch.append(message)
+            index += 1
+            embeds += len(message.embeds)
+            content += length
+            if message.view is not None or message.editable:
+                break
+        self.pending = deque(kept + pending[index:])
+        return batch
+
+class MessageScheduler:
+    """Sends all game messages, coalescing per channel within Discord's rate limits
+
+    Each channel has its own queue and token bucket; a global bucket caps the total
+    request rate. Sends in a channel go out in order, passing edits that are held
+    back to be merged. Channels with a pending turn prompt are served first, then
+    the least recently served channel, so one busy table cannot starve the others.
+    When messages pile up in a channel they are merged into a single message, and
+    queued edits of the same message are merged into one edit.
+    """
+
+    def __init__(self, global_rate: float = 40.0, channel_burst: int = 5, channel_period: float = 5.0):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.channel_burst = channel_burst
+        self.channel_rate = channel_burst / channel_period
+        self.channels: Dict[int, ChannelQueue] = {}
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.sends: set = set()
+        self._serve_counter = itertools.count(1)
+        self.stats = {'queued': 0, 'sent': 0, 'edited': 0, 'merged': 0, 'failed': 0, 'rate_limited': 0}
+
+    def start(self):
+        """Start the dispatcher task"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run(), name="message-scheduler")
+            logger.info("📮 Message scheduler started")
+
+    def stop(self):
+        """Stop the dispatcher; queued messages are dropped"""
+        if self.task:
+            self.task.cancel()
+        for queue in self.channels.values():
+            for message in queue.pending:
+                if not message.future.done():
+                    message.future.set_result(None)
+            queue.pending.clear()
+
+    def send(self, channel, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+             embeds: Optional[List[discord.Embed]] = None, view: Optional[discord.ui.View] = None,
+             priority: int = INFO, editable: bool = False) -> asyncio.Future:
+        """Queue a message for channel; await the result for the sent discord.Message
+
+        Pass editable=True for a message that will be edited later: it is sent on its
+        own, so an edit can't wipe out other messages merged into it.
+        """
+        embeds = list(embeds or [])
+        if embed is not None:
+            embeds.append(embed)
+
+        queue = self._queue(channel)
+        message = OutboundMessage(content, embeds, view, priority, editable=editable)
+        queue.pending.append(message)
+        self.stats['queued'] += 1
+        self.wakeup.set()
+        return message.future
+
+    def edit(self, channel, target: asyncio.Future, *, embed: Optional[discord.Embed] = None,
+             embeds: Optional[List[discord.Embed]] = None, view: Optional[discord.ui.View] = None,
+             priority: int = INFO, delay: float = 0.0) -> asyncio.Future:
+        """Queue an edit of the message target (a future from send) resolves to
+
+        The edit replaces the message's embeds and view (None removes the view). It
+        waits up to delay seconds, and a newer edit of the same message that is
+        queued meanwhile replaces it, so rapid updates collapse into one request.
+        """
+        embeds = list(embeds or [])
+        if embed is not None:
+            embeds.append(embed)
+
+        queue = self._queue(channel)
+        pending = queue.edits.get(target)
+        if pending is not None:
+            pending.embeds = embeds
+            pending.view = view
+            pending.priority = min(pending.priority, priority)
+            pending.not_before = min(pending.not_before, time.monotonic() + delay)
+            self.stats['merged'] += 1
+        else:
+            pending = OutboundMessage(None, embeds, view, priority, target=target, delay=delay)
+            queue.pending.append(pending)
+            queue.edits[target] = pending
+            self.stats['queued'] += 1
+        self.wakeup.set()
+        return pending.future
+
+    def _queue(self, channel) -> ChannelQueue:
+        queue = self.channels.get(channel.id)
+        if queue is None:
+            queue = ChannelQueue(channel, TokenBucket(self.channel_burst, self.channel_rate))
+            self.channels[channel.id] = queue
+        queue.channel = channel
+        return queue
+
+    def queue_depth(self) -> int:
+        """Messages waiting to be sent across all channels"""
+        return sum(len(queue.pending) for queue in self.channels.values())
+
+    def _next_queue(self) -> Optional[ChannelQueue]:
+        """Highest-priority ready channel, least recently served first"""
+        now = time.monotonic()
+        ready = [queue for queue in self.channels.values() if queue.ready(now)]
+        if not ready:
+            return None
+        return min(ready, key=lambda queue: (queue.priority, queue.last_served))
+
+    def _next_wait(self) -> Optional[float]:
+        """Seconds until a waiting channel can send again, None if nothing is waiting"""
+        now = time.monotonic()
+        waits = [max(queue.bucket.wait_time(), min(message.not_before for message in queue.pending) - now)
+                 for queue in self.channels.values() if queue.pending and not queue.busy]
+        return max(0.0, min(waits)) if waits else None
+
+    def _prune(self):
+        """Forget idle channels whose budget has fully recovered"""
+        for channel_id, queue in list(self.channels.items()):
+            if not queue.pending and not queue.busy and queue.bucket.available() \
+                    and queue.bucket.tokens >= queue.bucket.capacity:
+                del self.channels[channel_id]
+
+    async def run(self):
+        """Dispatch queued messages until cancelled"""
+        while True:
+            queue = self._next_queue()
+            if queue is None:
+                self._prune()
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=self._next_wait())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            if not self.global_bucket.available():
+                await asyncio.sleep(self.global_bucket.wait_time())
+                continue
+
+            self.global_bucket.take()
+            queue.bucket.take()
+            queue.busy = True
+            queue.last_served = next(self._serve_counter)
+            task = asyncio.create_task(self._deliver(queue, queue.take_batch(time.monotonic())))
+            self.sends.add(task)
+            task.add_done_callback(self.sends.discard)
+
+    async def _deliver(self, queue: ChannelQueue, batch: List[OutboundMessage]):
+        """Send a batch as one message (or apply one edit) and resolve its futures"""
+        if batch[0].target is not None:
+            await self._deliver_edit(queue, batch[0])
+            return
+
+        contents = [message.content for message in batch if message.content]
+        embeds = [embed for message in batch for embed in message.embeds]
+        view = batch[-1].view
+
+        kwargs = {}
+        if contents:
+            kwargs['content'] = "\n".join(contents)
+        if embeds:
+            kwargs['embeds'] = embeds
+        if view is not None:
+            kwargs['view'] = view
+
+        for message in batch:
+            metrics.observe("outbound.queue_wait", time.monotonic() - message.queued_at)
+
+        result = None
+        start = time.perf_counter()
+        try:
+            result = await queue.channel.send(**kwargs)
+            metrics.observe("outbound.send", time.perf_counter() - start)
+            self.stats['sent'] += 1
+            self.stats['merged'] += len(batch) - 1
+        except discord.HTTPException as e:
+            self.stats['failed'] += 1
+            if e.status == 429:
+                self.stats['rate_limited'] += 1
+            logger.error(f"❌ Failed to send to channel {queue.channel.id}: {e}")
+        except Exception:
+            self.stats['failed'] += 1
+            logger.exception(f"❌ Failed to send to channel {queue.channel.id}")
+        finally:
+            queue.busy = False
+            self.wakeup.set()
+
+        for message in batch:
+            if not message.future.done():
+                message.future.set_result(result)
+
+    async def _deliver_edit(self, queue: ChannelQueue, edit: OutboundMessage):
+        # Edits are held back until not_before on purpose, so only time past that counts as waiting
+        metrics.observe("outbound.queue_wait", max(0.0, time.monotonic() - edit.not_before))
+
+        result = None
+        try:
+            # The original send was queued earlier on this channel, so it has resolved
+            message = await edit.target
+            if message is not None:
+                start = time.perf_counter()
+                result = await message.edit(embeds=edit.embeds, view=edit.view)
+                metrics.observe("outbound.edit", time.perf_counter() - start)
+                self.stats['edited'] += 1
+        except discord.HTTPException as e:
+            self.stats['failed'] += 1
+            if e.status == 429:
+                self.stats['rate_limited'] += 1
+            logger.error(f"❌ Failed to edit message in channel {queue.channel.id}: {e}")
+        except Exception:
+            self.stats['failed'] += 1
+            logger.exception(f"❌ Failed to edit message in channel {queue.channel.id}")
+        finally:
+            queue.busy = False
+            self.wakeup.set()
+
+        if not edit.future.done():
+            edit.future.set_result(result)
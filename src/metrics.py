@@ -0,0 +1,148 @@
+import asyncio
+import bisect
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets in milliseconds (one overflow bucket follows)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 3000, 5000, 10000, 30000)
+LATENCY_LOG_INTERVAL = int(os.getenv("LATENCY_LOG_INTERVAL_S", "300"))
+
+class Histogram:
+    """Fixed-bucket latency histogram; percentiles are estimated within a bucket"""
+    
+    def __init__(self, name: str, bounds: Sequence[float] = BUCKETS_MS):
+        self.name = name
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+    
+    def percentile(self, point: float) -> float:
+        """Estimated latency (ms) below which point percent of observations fall"""
+        if not self.count:
+            return 0.0
+        rank = point / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = self.bounds[index - 1] if index else 0.0
+                high = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(self.max, low + (high - low) * (rank - seen) / count)
+            seen += count
+        return self.max
+    
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max
+        }
+
+# Every histogram by name, for reporting
+HISTOGRAMS: Dict[str, Histogram] = {}
+
+# Event counts by name (rounds_completed, tricks_completed, ...)
+COUNTERS: Dict[str, int] = {}
+
+# Most recent event loop lag in seconds, kept by the loop watchdog
+loop_lag = 0.0
+
+def histogram(name: str) -> Histogram:
+    """The histogram called name, created on first use"""
+    hist = HISTOGRAMS.get(name)
+    if hist is None:
+        hist = HISTOGRAMS[name] = Histogram(name)
+    return hist
+
+def observe(name: str, seconds: float):
+    """Record a duration in seconds"""
+    histogram(name).observe(seconds * 1000)
+
+def increment(name: str, amount: int = 1):
+    """Add to the counter called name"""
+    COUNTERS[name] = COUNTERS.get(name, 0) + amount
+
+@contextmanager
+def timed(name: str):
+    """Record how long the with-block takes (awaits included)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+class TimedResponse(discord.InteractionResponse):
+    """Interaction response that records the time to the first acknowledgement"""
+    
+    def __init__(self, parent: discord.Interaction, name: str):
+        super().__init__(parent)
+        self.metric = name
+    
+    def _acknowledged(self):
+        if self._response_type is None:
+            observe(self.metric, time.perf_counter() - self._parent.extras['received_at'])
+    
+    async def send_message(self, *args, **kwargs):
+        self._acknowledged()
+        return await super().send_message(*args, **kwargs)
+    
+    async def defer(self, *args, **kwargs):
+        self._acknowledged()
+        return await super().defer(*args, **kwargs)
+    
+    async def edit_message(self, *args, **kwargs):
+        self._acknowledged()
+        return await super().edit_message(*args, **kwargs)
+    
+    async def send_modal(self, *args, **kwargs):
+        self._acknowledged()
+        return await super().send_modal(*args, **kwargs)
+
+def track_interaction(interaction: discord.Interaction, kind: str):
+    """Start timing an interaction; its first response is recorded as first_response.<kind>"""
+    if 'received_at' in interaction.extras:
+        return
+    interaction.extras['received_at'] = time.perf_counter()
+    try:
+        interaction._cs_response  # Already created, too late to time it
+    except AttributeError:
+        interaction._cs_response = TimedResponse(interaction, f"first_response.{kind}")
+
+def since_received(interaction: discord.Interaction) -> Optional[float]:
+    """Seconds since track_interaction was called for interaction"""
+    received_at = interaction.extras.get('received_at')
+    return time.perf_counter() - received_at if received_at is not None else None
+
+def latency_stats(names: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Summaries of the histograms that have observations, by name"""
+    return {name: hist.summary() for name, hist in sorted(HISTOGRAMS.items())
+            if hist.count and (names is None or name in names)}
+
+def format_latency(stats: Dict[str, Dict[str, float]]) -> List[str]:
+    return [f"{name}: p50 {s['p50']:.1f} | p95 {s['p95']:.1f} | p99 {s['p99']:.1f} | max {s['max']:.1f} ms ({s['count']})"
+            for name, s in stats.items()]
+
+async def log_latency_periodically(interval: float = LATENCY_LOG_INTERVAL):
+    """Write every histogram's percentiles to the log every interval seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        lines = format_latency(latency_stats())
+        if lines:
+            logger.info("📈 Latency report:\n" + "\n".join(lines))
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import os
+import resource
+from typing import Dict, List, Optional
+
+from . import metrics
+from .render_cache import cache_stats
+
+logger = logging.getLogger(__name__)
+
+# Disabled unless METRICS_PORT is set
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = os.getenv("METRICS_PORT")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "jawaker"
+
+def _labels(labels: Dict[str, object]) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+class Exposition:
+    """Builds a Prometheus text exposition, one metric family at a time"""
+    
+    def __init__(self):
+        self.lines: List[str] = []
+    
+    def family(self, name: str, kind: str, help_text: str):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+    
+    def sample(self, metric: str, value: float, **labels):
+        self.lines.append(f"{metric}{_labels(labels)} {value}")
+    
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+def resident_memory() -> int:
+    """Resident set size of this process in bytes (peak RSS where /proc is missing)"""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def open_views(bot) -> int:
+    """Message components discord.py is still listening to"""
+    store = getattr(getattr(bot, "_connection", None), "_view_store", None)
+    if store is None:
+        return 0
+    return len({item.view.id for items in store._views.values() for item in items.values() if item.view})
+
+def render(bot) -> str:
+    """Every bot metric in Prometheus text format; only runs when scraped"""
+    out = Exposition()
+    
+    stats = bot.game_manager.get_game_stats()
+    out.family(f"{PREFIX}_games", "gauge", "Active games by type")
+    for game_type, count in stats['games_by_type'].items():
+        out.sample(f"{PREFIX}_games", count, type=game_type)
+    out.family(f"{PREFIX}_games_by_state", "gauge", "Active games by state")
+    for state, count in stats['games_by_state'].items():
+        out.sample(f"{PREFIX}_games_by_state", count, state=state)
+    out.family(f"{PREFIX}_players", "gauge", "Players seated in active games")
+    out.sample(f"{PREFIX}_players", stats['total_players'])
+    
+    for name, value in sorted(metrics.COUNTERS.items()):
+        out.family(f"{PREFIX}_{name}_total", "counter", name.replace("_", " ").capitalize())
+        out.sample(f"{PREFIX}_{name}_total", value)
+    
+    scheduler = bot.message_scheduler
+    if scheduler is not None:
+        out.family(f"{PREFIX}_messages_total", "counter", "Outbound message requests by result")
+        for result in ('sent', 'edited', 'merged', 'failed', 'rate_limited'):
+            out.sample(f"{PREFIX}_messages_total", scheduler.stats[result], result=result)
+        out.family(f"{PREFIX}_message_queue_depth", "gauge", "Messages waiting to be sent")
+        out.sample(f"{PREFIX}_message_queue_depth", scheduler.queue_depth())
+    
+    timers = getattr(bot, "turn_timers", None)
+    if timers is not None:
+        out.family(f"{PREFIX}_turn_timers", "gauge", "Turn clocks running on human prompts")
+        out.sample(f"{PREFIX}_turn_timers", timers.pending())
+    
+    pool = getattr(bot, "ai_pool", None)
+    if pool is not None:
+        out.family(f"{PREFIX}_ai_pool_queue_depth", "gauge", "AI decisions waiting for a worker or running")
+        out.sample(f"{PREFIX}_ai_pool_queue_depth", pool.pending)
+        out.family(f"{PREFIX}_ai_pool_decisions_total", "counter", "AI pool decisions by result")
+        for result, count in pool.stats.items():
+            out.sample(f"{PREFIX}_ai_pool_decisions_total", count, result=result)
+    
+    out.family(f"{PREFIX}_render_cache_lookups_total", "counter", "Render cache lookups by result")
+    for cache, counts in cache_stats().items():
+        out.sample(f"{PREFIX}_render_cache_lookups_total", counts['hits'], cache=cache, result="hit")
+        out.sample(f"{PREFIX}_render_cache_lookups_total", counts['misses'], cache=cache, result="miss")
+    
+    out.family(f"{PREFIX}_latency_seconds", "histogram",
+               "Interaction, command, game phase, AI, send and event loop latency")
+    for name, hist in sorted(metrics.HISTOGRAMS.items()):
+        cumulative = 0
+        for bound, count in zip(hist.bounds, hist.counts):
+            cumulative += count
+            out.sample(f"{PREFIX}_latency_seconds_bucket", cumulative, name=name, le=f"{bound / 1000:g}")
+        out.sample(f"{PREFIX}_latency_seconds_bucket", hist.count, name=name, le="+Inf")
+        out.sample(f"{PREFIX}_latency_seconds_sum", hist.total / 1000, name=name)
+        out.sample(f"{PREFIX}_latency_seconds_count", hist.count, name=name)
+    
+    out.family(f"{PREFIX}_event_loop_lag_seconds", "gauge", "Most recent event loop lag")
+    out.sample(f"{PREFIX}_event_loop_lag_seconds", metrics.loop_lag)
+    out.family(f"{PREFIX}_open_views", "gauge", "Message views still listening for clicks")
+    out.sample(f"{PREFIX}_open_views", open_views(bot))
+    out.family("process_resident_memory_bytes", "gauge", "Resident memory size in bytes")
+    out.sample("process_resident_memory_bytes", resident_memory())
+    return out.text()
+
+class MetricsServer:
+    """Minimal HTTP listener on the bot's event loop that serves GET /metrics"""
+    
+    def __init__(self, bot, host: str = METRICS_HOST, port: Optional[int] = None):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.server: Optional[asyncio.AbstractServer] = None
+    
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        logger.info(f"📈 Metrics served on http://{self.host}:{self.port}/metrics")
+    
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+    
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            method, path, _ = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ", 2)
+            if method != "GET":
+                status, body = "405 Method Not Allowed", "Method not allowed\n"
+            elif path.split("?", 1)[0] != "/metrics":
+                status, body = "404 Not Found", "Not found\n"
+            else:
+                status, body = "200 OK", render(self.bot)
+            payload = body.encode()
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                         f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError,
+                ConnectionError):
+            pass
+        except Exception:
+            logger.exception("❌ Failed to serve metrics")
+        finally:
+            writer.close()
+
+async def start_metrics_server(bot) -> Optional[MetricsServer]:
+    """Start the metrics listener if METRICS_PORT is set"""
+    if not METRICS_PORT:
+        return None
+    server = MetricsServer(bot, METRICS_HOST, int(METRICS_PORT))
+    await server.start()
+    return server
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .games.base_game import BaseGame
+
+logger = logging.getLogger(__name__)
+
+GAME_DB_PATH = os.getenv("GAME_DB_PATH", "data/games.db")
+SNAPSHOT_INTERVAL = int(os.getenv("GAME_SNAPSHOT_INTERVAL_MS", "500")) / 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    channel_id INTEGER PRIMARY KEY,
+    game_id TEXT NOT NULL,
+    game_type TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    snapshot BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS guild_settings (
+    guild_id INTEGER PRIMARY KEY,
+    pace REAL NOT NULL
+)
+"""
+
+class GameStore:
+    """Persists game snapshots to SQLite so running games survive a restart
+    
+    Saves are coalesced per game: a game is written at most once per interval,
+    with the snapshot taken when the write happens, so a burst of moves costs a
+    single write. The database is only touched from one worker thread, keeping
+    disk I/O off the event loop.
+    """
+    
+    def __init__(self, path: str = GAME_DB_PATH, interval: float = SNAPSHOT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="game-store")
+        self.conn: Optional[sqlite3.Connection] = None
+        self.dirty: Dict[int, BaseGame] = {}  # channel_id -> game waiting for its write
+        self.timers: Dict[int, asyncio.TimerHandle] = {}
+        self.last_write: Dict[int, float] = {}
+        self.stats = {'saved': 0, 'deleted': 0, 'failed': 0}
+    
+    async def open(self):
+        """Open (and create) the database"""
+        await self._run(self._open)
+        logger.info(f"💾 Game store opened at {self.path}")
+    
+    def _open(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+    
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+    
+    def save(self, game: BaseGame):
+        """Schedule a snapshot of game, merged with any save already pending"""
+        channel_id = game.channel_id
+        self.dirty[channel_id] = game
+        if channel_id in self.timers:
+            return
+        
+        elapsed = time.monotonic() - self.last_write.get(channel_id, 0.0)
+        delay = max(0.0, self.interval - elapsed)
+        loop = asyncio.get_running_loop()
+        self.timers[channel_id] = loop.call_later(delay, self._flush, channel_id)
+    
+    def _flush(self, channel_id: int):
+        """Take the snapshot on the loop and hand the write to the worker thread"""
+        self.timers.pop(channel_id, None)
+        game = self.dirty.pop(channel_id, None)
+        if game is None:
+            return
+        
+        try:
+            data = game.snapshot()
+        except Exception:
+            self.stats['failed'] += 1
+            logger.exception(f"❌ Failed to snapshot game in channel {channel_id}")
+            return
+        if data is None:
+            return
+        
+        self.last_write[channel_id] = time.monotonic()
+        row = (channel_id, game.game_id, game.game_type, game.state, time.time(), data)
+        self.executor.submit(self._write, row)
+    
+    def _write(self, row: Tuple):
+        try:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO games (channel_id, game_id, game_type, state, updated_at, snapshot) "
+                "VALUES (?, ?, ?, ?, ?, ?)", row)
+            self.conn.commit()
+            self.stats['saved'] += 1
+        except sqlite3.Error as e:
+            self.stats['failed'] += 1
+            logger.error(f"❌ Failed to save game in channel {row[0]}: {e}")
+    
+    def delete(self, channel_id: int):
+        """Drop a game's snapshot, cancelling any pending save"""
+        timer = self.timers.pop(channel_id, None)
+        if timer:
+            timer.cancel()
+        self.dirty.pop(channel_id, None)
+        self.last_write.pop(channel_id, None)
+        self.executor.submit(self._delete, channel_id)
+    
+    def _delete(self, channel_id: int):
+        try:
+            self.conn.execute("DELETE FROM games WHERE channel_id = ?", (channel_id,))
+            self.conn.commit()
+            self.stats['deleted'] += 1
+        except sqlite3.Error as e:
+            self.stats['failed'] += 1
+            logger.error(f"❌ Failed to delete game in channel {channel_id}: {e}")
+    
+    def save_guild_pace(self, guild_id: int, pace: float):
+        """Remember a guild's pacing multiplier"""
+        self.executor.submit(self._write_guild_pace, guild_id, pace)
+    
+    def _write_guild_pace(self, guild_id: int, pace: float):
+        try:
+            self.conn.execute("INSERT OR REPLACE INTO guild_settings (guild_id, pace) VALUES (?, ?)", (guild_id, pace))
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self.stats['failed'] += 1
+            logger.error(f"❌ Failed to save settings of guild {guild_id}: {e}")
+    
+    async def load_guild_paces(self) -> Dict[int, float]:
+        """guild_id -> pacing multiplier of every guild that set one"""
+        return dict(await self._run(self._load_guild_paces))
+    
+    def _load_guild_paces(self) -> List[Tuple[int, float]]:
+        return self.conn.execute("SELECT guild_id, pace FROM guild_settings").fetchall()
+    
+    async def load_all(self) -> List[Tuple[int, str, bytes]]:
+        """(channel_id, game_type, snapshot) of every stored game"""
+        return await self._run(self._load_all)
+    
+    def _load_all(self) -> List[Tuple[int, str, bytes]]:
+        return self.conn.execute("SELECT channel_id, game_type, snapshot FROM games").fetchall()
+    
+    async def close(self):
+        """Write all pending saves and close the database"""
+        for channel_id in list(self.timers):
+            self.timers[channel_id].cancel()
+            self._flush(channel_id)
+        if self.conn is not None:
+            await self._run(self.conn.close)
+            self.conn = None
+        self.executor.shutdown(wait=True)
+        logger.info(f"💾 Game store closed ({self.stats['saved']} saves)")
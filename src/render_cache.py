@@ -0,0 +1,60 @@
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class RenderCache:
+    """Keyed cache of rendered output (embeds, component templates, strings)
+
+    Cached values are shared between callers and must not be mutated. With a
+    maxsize the least recently used entry is evicted first.
+    """
+
+    def __init__(self, name: str, maxsize: Optional[int] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        CACHES[name] = self
+
+    def get(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Return the value cached for key, building and storing it on a miss"""
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self.entries[key] = build()
+            if self.maxsize is not None and len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return value
+
+        self.hits += 1
+        if self.maxsize is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+# Every cache by name, for reporting
+CACHES: Dict[str, RenderCache] = {}
+
+# Prebuilt embeds for responses that only depend on their key (e.g. /rules)
+STATIC_EMBEDS = RenderCache("static_embeds", maxsize=64)
+
+def cache_stats() -> Dict[str, Dict[str, float]]:
+    """Hit/miss counters of every render cache"""
+    return {name: cache.stats() for name, cache in CACHES.items()}
@@ -0,0 +1,79 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class Timer:
+    """A pending callback; cancel() leaves it in the heap to be skipped when due"""
+
+    __slots__ = ('deadline', 'order', 'callback', 'args', 'cancelled')
+
+    def __init__(self, deadline: float, order: int, callback: Callable, args: tuple):
+        self.deadline = deadline
+        self.order = order
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other: "Timer") -> bool:
+        return (self.deadline, self.order) < (other.deadline, other.order)
+
+    def cancel(self):
+        self.cancelled = True
+
+class TurnTimers:
+    """Turn clocks for every game, kept in one heap and run by one task
+
+    An idle table costs a heap entry rather than a sleeping task. The task
+    sleeps until the earliest deadline and is woken when an earlier one is
+    added. Callbacks run on the event loop and must not block.
+    """
+
+    def __init__(self):
+        self.heap: List[Timer] = []
+        self.counter = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.fired = 0
+
+    def start(self):
+        self.task = asyncio.create_task(self.run(), name="turn-timers")
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+
+    def pending(self) -> int:
+        return sum(not timer.cancelled for timer in self.heap)
+
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        """Run callback(*args) after delay seconds"""
+        timer = Timer(time.monotonic() + delay, next(self.counter), callback, args)
+        heapq.heappush(self.heap, timer)
+        if self.heap[0] is timer:
+            self.wakeup.set()
+        return timer
+
+    async def run(self):
+        while True:
+            now = time.monotonic()
+            while self.heap and (self.heap[0].cancelled or self.heap[0].deadline <= now):
+                timer = heapq.heappop(self.heap)
+                if timer.cancelled:
+                    continue
+                self.fired += 1
+                try:
+                    timer.callback(*timer.args)
+                except Exception:
+                    logger.exception("❌ Turn timer callback failed")
+
+            self.wakeup.clear()
+            timeout = self.heap[0].deadline - now if self.heap else None
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from . import metrics
+from .games.base_game import BaseGame
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_THRESHOLD = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "250")) / 1000
+ASYNCIO_DEBUG = os.getenv("ASYNCIO_DEBUG", "").lower() in ("1", "true", "yes")
+SLOW_CALLBACK_DURATION = int(os.getenv("ASYNCIO_SLOW_CALLBACK_MS", "100")) / 1000
+STACK_DEPTH = 15  # Innermost frames logged for a stall
+
+def game_context(frame) -> str:
+    """Describe the innermost game method on a stack, if any"""
+    while frame is not None:
+        try:
+            owner = frame.f_locals.get('self')
+        except Exception:
+            owner = None
+        if isinstance(owner, BaseGame):
+            return f" in {owner.game_type} game {owner.game_id} (channel {owner.channel_id})"
+        frame = frame.f_back
+    return ""
+
+class LoopWatchdog:
+    """Measures event loop lag and logs the stack of whatever blocks the loop
+    
+    A heartbeat task on the loop records loop.lag and the time of its last
+    beat. A sampling thread checks the heartbeat; once it is threshold
+    overdue it captures the loop thread's stack, which shows the coroutine
+    or callback that is still running, and logs it with the game it belongs
+    to. Each stall is reported once.
+    """
+    
+    def __init__(self, threshold: float = LOOP_LAG_THRESHOLD, interval: float = 0.1):
+        self.threshold = threshold
+        self.interval = interval
+        self.beat = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+        self.stalls = 0
+    
+    def start(self):
+        """Start the heartbeat on the running loop and the sampling thread"""
+        self.loop_thread_id = threading.get_ident()
+        self.beat = time.monotonic()
+        self.task = asyncio.create_task(self.heartbeat(), name="loop-watchdog")
+        self.thread = threading.Thread(target=self.watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+        logger.info(f"🐕 Loop watchdog started (threshold {self.threshold * 1000:.0f} ms)")
+    
+    def stop(self):
+        self.stopped.set()
+        if self.task:
+            self.task.cancel()
+    
+    async def heartbeat(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.beat = time.monotonic()
+            metrics.loop_lag = max(0.0, self.beat - start - self.interval)
+            metrics.observe("loop.lag", metrics.loop_lag)
+            if metrics.loop_lag >= self.threshold:
+                logger.warning(f"🐢 Event loop recovered after a {metrics.loop_lag * 1000:.0f} ms stall")
+    
+    def watch(self):
+        reported = False
+        while not self.stopped.wait(self.threshold / 4):
+            stalled = time.monotonic() - self.beat - self.interval
+            if stalled < self.threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            
+            reported = True
+            self.stalls += 1
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame, limit=STACK_DEPTH))
+            logger.warning(f"🐢 Event loop blocked for {stalled * 1000:.0f} ms{game_context(frame)}:\n{stack}")
+
+def configure_debug(loop: asyncio.AbstractEventLoop):
+    """Turn on asyncio debug mode and slow-callback warnings when ASYNCIO_DEBUG is set"""
+    if not ASYNCIO_DEBUG:
+        return
+    loop.set_debug(True)
+    loop.slow_callback_duration = SLOW_CALLBACK_DURATION
+    logging.getLogger("asyncio").setLevel(logging.WARNING)
+    logger.info(f"🔍 asyncio debug mode on (slow callbacks over {SLOW_CALLBACK_DURATION * 1000:.0f} ms are logged)")